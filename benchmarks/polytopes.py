@@ -0,0 +1,141 @@
+"""Benchmarks polytope generation for every ringing of the supported Coxeter groups.
+
+Each stage of generation is profiled through CoxeterDiagram.profile, recording its time,
+peak traced memory and counters, and the counts it produces are checked against the
+closed forms in polytope_visualizer.math.groups, so both slowdowns and numerically
+duplicated or lost vertices show up. Results are written as
+JSON, and a previous results file can be passed to --compare to list regressions.
+
+    python -m benchmarks.polytopes --output bench.json
+    python -m benchmarks.polytopes --groups H4 B5 --compare bench.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from polytope_visualizer.math.diagram import CoxeterDiagram, _mirror_normals
+from polytope_visualizer.math.groups import face_counts, orbit_size, coxeter_matrix
+
+FORMAT_VERSION = 2
+
+GROUPS = ['A2', 'A3', 'A4', 'A5', 'A6', 'B2', 'B3', 'B4', 'B5', 'B6', 'D4', 'D5', 'D6',
+          'E6', 'F4', 'H3', 'H4', 'I2(5)', 'I2(7)', 'I2(8)']
+
+
+def _measure(function):
+    """Runs a function, returning its result, wall time and peak traced memory"""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        return result, seconds, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(diagram: CoxeterDiagram):
+    """Generates a polytope and returns the measurements of each stage, including the
+    enumeration of every rank of its face lattice"""
+    # The normals are memoized, so have them computed afresh
+    _mirror_normals.cache_clear()
+    polytope, stats = diagram.profile(trace_memory=True)
+    stages = stats.as_dict()
+    stages['orbit']['count'] = len(polytope.vertices)
+    stages['edges']['count'] = len(polytope.edges)
+    stages['faces']['count'] = polytope.face_count()
+
+    for rank in range(diagram.dimension):
+        faces, seconds, peak = _measure(lambda: polytope.lattice.faces(rank))
+        stages[f'lattice_{rank}'] = {'seconds': seconds, 'peak_bytes': peak, 'count': faces.shape[0]}
+    return stages
+
+
+def check(diagram: CoxeterDiagram, stages):
+    """Returns the mismatches between the measured counts and the closed forms"""
+    matrix = diagram.coxeter_matrix()
+    expected = face_counts(matrix, diagram.nodes) + [1]
+    wanted = {'orbit': orbit_size(matrix, diagram.nodes), 'edges': expected[1], 'faces': expected[2]}
+    for rank in range(diagram.dimension):
+        wanted[f'lattice_{rank}'] = expected[rank]
+
+    return [f"{name}: {stages[name]['count']} != {count}"
+            for name, count in wanted.items() if stages[name]['count'] != count]
+
+
+def ringings(rank):
+    for nodes in itertools.product((0, 1), repeat=rank):
+        if any(nodes):
+            yield list(nodes)
+
+
+def run(groups, min_nodes=2, max_nodes=6, log=print):
+    results = []
+    for group in groups:
+        rank = len(coxeter_matrix(group))
+        if not min_nodes <= rank <= max_nodes:
+            continue
+        for nodes in ringings(rank):
+            diagram = CoxeterDiagram.from_group(group, nodes)
+            stages = benchmark(diagram)
+            errors = check(diagram, stages)
+            total = sum(stage['seconds'] for stage in stages.values())
+            peak = max(stage['peak_bytes'] for stage in stages.values())
+            results.append({'group': group, 'nodes': nodes, 'seconds': total,
+                            'peak_bytes': peak, 'stages': stages, 'errors': errors})
+            log(f"{group:>6} {''.join(map(str, nodes)):>6} {total:8.3f}s {peak / 2**20:8.1f}MiB "
+                f"V={stages['orbit']['count']} E={stages['edges']['count']} "
+                f"F={stages['faces']['count']}" + (f"  MISMATCH {errors}" if errors else ""))
+    return results
+
+
+def compare(results, baseline, threshold=1.5):
+    """Returns (key, old seconds, new seconds) for runs at least `threshold` times slower
+    than in the baseline results"""
+    old = {(r['group'], tuple(r['nodes'])): r['seconds'] for r in baseline['results']}
+    slower = []
+    for r in results:
+        key = (r['group'], tuple(r['nodes']))
+        # Ignore runs too quick to time reliably
+        if key in old and r['seconds'] > max(threshold * old[key], 0.01):
+            slower.append((key, old[key], r['seconds']))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', nargs='+', default=GROUPS)
+    parser.add_argument('--min-nodes', type=int, default=2)
+    parser.add_argument('--max-nodes', type=int, default=6)
+    parser.add_argument('--output', help="file to write the JSON results to")
+    parser.add_argument('--compare', help="earlier JSON results to check for regressions")
+    args = parser.parse_args(argv)
+
+    results = run(args.groups, args.min_nodes, args.max_nodes)
+    report = {
+        'format': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    failed = [r for r in results if r['errors']]
+    if args.compare:
+        with open(args.compare) as f:
+            for key, old, new in compare(results, json.load(f)):
+                print(f"slower: {key} {old:.3f}s -> {new:.3f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Generates many polytopes without the GUI, spread over a pool of processes.
+
+Diagrams are given as Schläfli symbols, Dynkin strings or group names with their rings
+(see groups.parse_diagram); a bare group name stands for every ringing of the group.
+Each polytope is written to the output directory as an .npz file of its arrays, or in
+one of the formats of polytope_visualizer.export, and a results.json there records the
+timing and counts of every diagram. Nothing here imports PyQt5 or OpenGL.
+
+    python -m polytope_visualizer '{5,3,3}' x4o3o3x B4 --output polytopes
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .export import export
+from .math.diagram import CoxeterDiagram
+from .math.groups import parse_diagram
+from .math.progress import GenerationAborted
+
+FORMAT_VERSION = 1
+
+
+def expand(specs):
+    """Returns a (label, diagram) pair for each diagram described by the specs"""
+    diagrams = []
+    for spec in specs:
+        matrix, nodes = parse_diagram(spec)
+        if nodes is not None:
+            diagrams.append((spec, CoxeterDiagram.from_matrix(nodes, matrix)))
+            continue
+        for rings in itertools.product((0, 1), repeat=len(matrix)):
+            if any(rings):
+                label = f"{spec}:{''.join(map(str, rings))}"
+                diagrams.append((label, CoxeterDiagram.from_matrix(rings, matrix)))
+    return diagrams
+
+
+def file_name(label, extension='npz'):
+    return re.sub(r'[^\w.-]+', '_', label).strip('_') + '.' + extension
+
+
+def generate(label, diagram, output, backend='todd_coxeter', max_vertices=None, extension='npz'):
+    """Generates one polytope into the output directory and returns its record for
+    results.json. Failures are recorded rather than raised, so one bad diagram does not
+    stop a batch, and polytopes known to have more than `max_vertices` vertices are
+    skipped without being generated."""
+    record = {'label': label, 'nodes': [int(bool(n)) for n in diagram.nodes]}
+    start = time.perf_counter()
+    count = diagram.analyse().vertex_count
+    if max_vertices is not None and count is not None and count > max_vertices:
+        record.update(seconds=time.perf_counter() - start, vertices=count,
+                      skipped=f"{count} vertices is over the limit of {max_vertices}")
+        return record
+    try:
+        polytope, stats = diagram.profile(backend)
+        path = os.path.join(output, file_name(label, extension))
+        if extension == 'npz':
+            np.savez(path, vertices=polytope.vertices, edges=polytope.edges,
+                     face_offsets=polytope.faces[0], face_indices=polytope.faces[1])
+        else:
+            export(path, polytope)
+    except (ValueError, RuntimeError, GenerationAborted) as e:
+        record.update(seconds=time.perf_counter() - start, error=str(e))
+        return record
+
+    record.update(seconds=time.perf_counter() - start, file=os.path.basename(path),
+                  vertices=len(polytope.vertices), edges=len(polytope.edges),
+                  faces=polytope.face_count(), stages=stats.as_dict())
+    return record
+
+
+def _generate(job):
+    # Diagrams are sent to the workers as plain lists
+    label, nodes, matrix, *options = job
+    return generate(label, CoxeterDiagram.from_matrix(nodes, matrix), *options)
+
+
+def run(diagrams, output, jobs=None, backend='todd_coxeter', max_vertices=None, extension='npz',
+        log=print):
+    """Generates every (label, diagram) pair, using `jobs` processes (all cores by
+    default, or none at all for 1), and returns their records in the order given"""
+    os.makedirs(output, exist_ok=True)
+    work = [(label, list(d.nodes), [list(row) for row in d.matrix], output, backend, max_vertices,
+             extension) for label, d in diagrams]
+
+    def done(record):
+        if 'error' in record:
+            log(f"{record['label']:>20} failed after {record['seconds']:.3f}s: {record['error']}")
+        elif 'skipped' in record:
+            log(f"{record['label']:>20} skipped: {record['skipped']}")
+        else:
+            log(f"{record['label']:>20} {record['seconds']:8.3f}s V={record['vertices']} "
+                f"E={record['edges']} F={record['faces']}")
+
+    records = [None] * len(work)
+    if jobs == 1:
+        for idx, job in enumerate(work):
+            records[idx] = _generate(job)
+            done(records[idx])
+    else:
+        with ProcessPoolExecutor(jobs) as executor:
+            futures = {executor.submit(_generate, job): idx for idx, job in enumerate(work)}
+            for future in as_completed(futures):
+                records[futures[future]] = future.result()
+                done(records[futures[future]])
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('diagrams', nargs='+',
+                        help="Schläfli symbols like {5,3,3} or t0,2{4,3}, Dynkin strings like "
+                             "x4o3o3x, or group names like E6:100001, alone for every ringing")
+    parser.add_argument('--output', default='polytopes', help="directory to write the results to")
+    parser.add_argument('--jobs', type=int, help="number of processes, all cores by default")
+    parser.add_argument('--backend', default='todd_coxeter')
+    parser.add_argument('--format', default='npz', choices=['npz', 'ply', 'off', 'glb', 'gltf'])
+    parser.add_argument('--max-vertices', type=int, help="skip polytopes with more vertices")
+    parser.add_argument('--verbose', action='store_true', help="log the stages of each generation")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    try:
+        diagrams = expand(args.diagrams)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    records = run(diagrams, args.output, args.jobs, args.backend, args.max_vertices, args.format)
+    with open(os.path.join(args.output, 'results.json'), 'w') as f:
+        json.dump({'format': FORMAT_VERSION, 'backend': args.backend,
+                   'seconds': time.perf_counter() - start, 'results': records}, f, indent=1)
+    return 1 if any('error' in r for r in records) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
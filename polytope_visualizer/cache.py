@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .math.diagram import CoxeterDiagram, Polytope
+from .math.wythoff import FaceLattice
+
+# Bump whenever generation changes in a way that alters the stored arrays
+ALGORITHM_VERSION = 3
+
+_ARRAYS = ('vertices', 'edges', 'face_offsets', 'face_indices', 'permutations')
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'polytope_visualizer')
+
+
+class PolytopeCache:
+    """A content-addressed on-disk cache of generated polytopes.
+
+    Entries are keyed by the diagram and ALGORITHM_VERSION and hold the polytope's arrays
+    as .npy files, which are memory-mapped when loaded. Entries are stored in the canonical
+    orientation, so a mirror image's vertices are rotated into a copy in memory instead.
+    Once the cache grows past `max_bytes` the least recently used entries are evicted."""
+    def __init__(self, directory=None, max_bytes=512 * 2**20):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, diagram: CoxeterDiagram):
+        canonical = diagram.canonical()
+        description = {
+            'nodes': [int(bool(n)) for n in canonical.nodes],
+            'matrix': [list(row) for row in canonical.matrix],
+            'version': ALGORITHM_VERSION,
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def load(self, diagram: CoxeterDiagram):
+        """Returns the cached polytope for a diagram, or None if it is not cached"""
+        path = self._path(self.key(diagram))
+        try:
+            arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+                      for name in _ARRAYS}
+            # Mark the entry as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        # Entries are shared with the mirror image and stored in the canonical orientation
+        canonical = diagram.canonical()
+        lattice = FaceLattice(arrays['permutations'], canonical.coxeter_matrix(),
+                              [bool(n) for n in canonical.nodes])
+        return diagram.orient(Polytope(arrays['vertices'], arrays['edges'],
+                                       (arrays['face_offsets'], arrays['face_indices']), lattice))
+
+    def store(self, diagram: CoxeterDiagram, polytope: Polytope):
+        """Stores the polytope of a diagram, turned to the canonical orientation first if
+        the diagram is not canonical"""
+        canonical = diagram.canonical()
+        if canonical is not diagram:
+            polytope = canonical._from_mirror_image(polytope)
+        os.makedirs(self.directory, exist_ok=True)
+        arrays = {
+            'vertices': polytope.vertices,
+            'edges': polytope.edges,
+            'face_offsets': polytope.faces[0],
+            'face_indices': polytope.faces[1],
+            'permutations': polytope.lattice.permutations,
+        }
+
+        # Write into a scratch directory and move it into place, so a half-written entry
+        # is never visible to readers
+        scratch = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(scratch, name + '.npy'), np.ascontiguousarray(array))
+            os.replace(scratch, self._path(self.key(diagram)))
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        self.evict()
+
+    def polytope(self, diagram: CoxeterDiagram, dtype=np.float64, **kwargs):
+        """Returns the polytope for a diagram, generating and storing it if needed. Keyword
+        arguments are passed on to CoxeterDiagram.polytope."""
+        polytope = self.load(diagram)
+        if polytope is None:
+            canonical = diagram.canonical()
+            generated = canonical.polytope(**kwargs)
+            self.store(canonical, generated)
+            polytope = diagram.orient(generated)
+        return polytope.astype(dtype)
+
+    def entries(self):
+        """Returns (last use, size in bytes, path) for each entry, oldest first"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path))
+            entries.append((os.stat(path).st_mtime, size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits its budget"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,238 @@
+"""Writes polytopes to PLY, OFF and glTF files.
+
+Every exporter streams the vertex, edge and face arrays to the file a chunk of rows at a
+time, straight from numpy buffers, so memory stays flat and large polytopes are written
+about as fast as the disk allows. Tools expect three dimensional positions, which are
+the first three coordinates of each vertex (padded with zeros in lower dimensions); the
+full n-D coordinates go alongside them wherever the format has room."""
+import json
+import os
+import struct
+from contextlib import contextmanager
+
+import numpy as np
+
+CHUNK_ROWS = 1 << 16
+
+
+@contextmanager
+def _binary(file):
+    """Opens a path for writing, or passes through a file object that is already open"""
+    if hasattr(file, 'write'):
+        yield file
+    else:
+        with open(file, 'wb') as f:
+            yield f
+
+
+def _chunks(array, rows=CHUNK_ROWS):
+    for start in range(0, len(array), rows):
+        yield np.asarray(array[start:start + rows])
+
+
+def _positions(vertices):
+    """Returns the first three coordinates of each vertex as float32"""
+    positions = np.zeros((vertices.shape[0], 3), np.float32)
+    dimension = min(vertices.shape[1], 3)
+    positions[:, :dimension] = vertices[:, :dimension]
+    return positions
+
+
+def _face_runs(faces, rows=CHUNK_ROWS):
+    """Yields the faces as (F, k) arrays of index cycles, each holding faces of one size.
+    Faces come in classes of equal size, so there are only a few runs."""
+    offsets, indices = faces
+    sizes = np.diff(offsets)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sizes)) + 1, [sizes.shape[0]]))
+    for first, last in zip(starts[:-1], starts[1:]):
+        for start in range(first, last, rows):
+            stop = min(start + rows, last)
+            yield np.asarray(indices[offsets[start]:offsets[stop]]).reshape(stop - start, -1)
+
+
+def _text_rows(file, array, fmt):
+    """Writes an array as text a chunk at a time, each chunk formatted as a whole"""
+    row = ' '.join([fmt] * array.shape[1]) + '\n'
+    for chunk in _chunks(array):
+        file.write(((row * chunk.shape[0]) % tuple(chunk.ravel().tolist())).encode())
+
+
+def write_ply(file, polytope):
+    """Writes a binary little-endian PLY file. Vertices have float x, y and z properties
+    followed by their n-D coordinates as doubles c0, c1, ...; faces are vertex_indices
+    lists and edges are written as an edge element."""
+    vertices, edges = polytope.vertices, polytope.edges
+    dimension = polytope.dimension
+    sizes = np.diff(polytope.faces[0])
+    count_type = 'uchar' if sizes.max(initial=0) < 256 else 'uint'
+
+    header = ['ply', 'format binary_little_endian 1.0', 'comment polytope_visualizer',
+              f'element vertex {len(vertices)}',
+              'property float x', 'property float y', 'property float z']
+    header += [f'property double c{axis}' for axis in range(dimension)]
+    header += [f'element face {sizes.shape[0]}', f'property list {count_type} int vertex_indices',
+               f'element edge {len(edges)}', 'property int vertex1', 'property int vertex2',
+               'end_header']
+
+    vertex = np.dtype([('position', '<f4', 3), ('coordinates', '<f8', dimension)])
+    with _binary(file) as f:
+        f.write(('\n'.join(header) + '\n').encode('ascii'))
+        for chunk in _chunks(vertices):
+            records = np.empty(chunk.shape[0], vertex)
+            records['position'] = _positions(chunk)
+            records['coordinates'] = chunk
+            f.write(records)
+
+        for cycles in _face_runs(polytope.faces):
+            face = np.dtype([('count', 'u1' if count_type == 'uchar' else '<u4'),
+                             ('indices', '<i4', cycles.shape[1])])
+            records = np.empty(cycles.shape[0], face)
+            records['count'] = cycles.shape[1]
+            records['indices'] = cycles
+            f.write(records)
+
+        for chunk in _chunks(edges):
+            f.write(np.ascontiguousarray(chunk, '<i4'))
+
+
+def write_off(file, polytope):
+    """Writes an OFF file, or an nOFF file with the full coordinates when the polytope is
+    not three dimensional. OFF has no room for edges, so only their count is given."""
+    vertices = polytope.vertices
+    header = 'OFF\n' if polytope.dimension == 3 else f'nOFF\n{polytope.dimension}\n'
+    with _binary(file) as f:
+        f.write(f'{header}{len(vertices)} {polytope.face_count()} {len(polytope.edges)}\n'.encode('ascii'))
+        for chunk in _chunks(vertices):
+            _text_rows(f, chunk, '%.17g')
+        for cycles in _face_runs(polytope.faces):
+            sizes = np.full((cycles.shape[0], 1), cycles.shape[1], cycles.dtype)
+            _text_rows(f, np.concatenate((sizes, cycles), axis=1), '%d')
+
+
+# glTF constants
+_FLOAT, _UINT = 5126, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+_LINES, _TRIANGLES = 1, 4
+_TYPES = {1: 'SCALAR', 2: 'VEC2', 3: 'VEC3', 4: 'VEC4'}
+
+
+def _triangles(cycles):
+    """Splits convex faces into fans of triangles"""
+    k = cycles.shape[1]
+    fans = np.empty((cycles.shape[0], k - 2, 3), np.uint32)
+    fans[:, :, 0] = cycles[:, :1]
+    fans[:, :, 1] = cycles[:, 1:-1]
+    fans[:, :, 2] = cycles[:, 2:]
+    return fans.reshape(-1, 3)
+
+
+def _gltf(polytope):
+    """Lays out the binary buffer of a polytope. Returns the glTF document, the buffer's
+    length and a generator of its contents."""
+    vertices, edges, faces = polytope.vertices, polytope.edges, polytope.faces
+    dimension = polytope.dimension
+    count = len(vertices)
+    triangles = max(faces[1].shape[0] - 2 * polytope.face_count(), 0)
+
+    low = np.full(3, np.inf, np.float32)
+    high = np.full(3, -np.inf, np.float32)
+    for chunk in _chunks(vertices):
+        positions = _positions(chunk)
+        low = np.minimum(low, positions.min(axis=0, initial=np.inf))
+        high = np.maximum(high, positions.max(axis=0, initial=-np.inf))
+
+    # Positions, then the n-D coordinates four at a time, then the line and triangle
+    # indices. Every element is four bytes, so every view stays aligned.
+    views, accessors, attributes = [], [], {}
+    length = 0
+
+    def add(components, items, component_type, target, **accessor):
+        nonlocal length
+        views.append({'buffer': 0, 'byteOffset': length, 'byteLength': 4 * components * items,
+                      'target': target})
+        accessors.append({'bufferView': len(views) - 1, 'componentType': component_type,
+                          'count': items * (1 if target == _ARRAY_BUFFER else components),
+                          'type': _TYPES[components] if target == _ARRAY_BUFFER else 'SCALAR',
+                          **accessor})
+        length += 4 * components * items
+        return len(accessors) - 1
+
+    attributes['POSITION'] = add(3, count, _FLOAT, _ARRAY_BUFFER, min=low.tolist(), max=high.tolist())
+    groups = [(start, min(start + 4, dimension)) for start in range(0, dimension, 4)]
+    for idx, (start, stop) in enumerate(groups):
+        attributes[f'_COORDINATES{idx}'] = add(stop - start, count, _FLOAT, _ARRAY_BUFFER)
+
+    primitives = []
+    if len(edges):
+        primitives.append({'attributes': attributes, 'mode': _LINES,
+                           'indices': add(2, len(edges), _UINT, _ELEMENT_ARRAY_BUFFER)})
+    if triangles:
+        primitives.append({'attributes': attributes, 'mode': _TRIANGLES,
+                           'indices': add(3, triangles, _UINT, _ELEMENT_ARRAY_BUFFER)})
+    if not primitives:
+        primitives.append({'attributes': attributes, 'mode': 0})
+
+    document = {
+        'asset': {'version': '2.0', 'generator': 'polytope_visualizer'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'mesh': 0}],
+        'meshes': [{'primitives': primitives, 'extras': {'dimension': dimension}}],
+        'buffers': [{'byteLength': length}],
+        'bufferViews': views,
+        'accessors': accessors,
+    }
+
+    def contents():
+        for chunk in _chunks(vertices):
+            yield _positions(chunk)
+        for start, stop in groups:
+            for chunk in _chunks(vertices):
+                yield np.ascontiguousarray(chunk[:, start:stop], '<f4')
+        for chunk in _chunks(edges):
+            yield np.ascontiguousarray(chunk, '<u4')
+        for cycles in _face_runs(faces):
+            yield _triangles(cycles)
+
+    return document, length, contents()
+
+
+def write_glb(file, polytope):
+    """Writes a binary glTF file with one mesh of lines for the edges and triangles for the
+    faces. The n-D coordinates are the custom attributes _COORDINATES0, _COORDINATES1, ...
+    of up to four components each."""
+    document, length, contents = _gltf(polytope)
+    text = json.dumps(document, separators=(',', ':')).encode()
+    text += b' ' * (-len(text) % 4)
+    with _binary(file) as f:
+        f.write(struct.pack('<4sII', b'glTF', 2, 12 + 8 + len(text) + 8 + length))
+        f.write(struct.pack('<I4s', len(text), b'JSON'))
+        f.write(text)
+        f.write(struct.pack('<I4s', length, b'BIN\0'))
+        for array in contents:
+            f.write(array)
+
+
+def write_gltf(path, polytope):
+    """Writes a glTF file laid out as by write_glb, with its buffer in a .bin file next to
+    it"""
+    document, _, contents = _gltf(polytope)
+    buffer = os.path.splitext(path)[0] + '.bin'
+    document['buffers'][0]['uri'] = os.path.basename(buffer)
+    with open(buffer, 'wb') as f:
+        for array in contents:
+            f.write(array)
+    with open(path, 'w') as f:
+        json.dump(document, f)
+
+
+WRITERS = {'.ply': write_ply, '.off': write_off, '.glb': write_glb, '.gltf': write_gltf}
+
+
+def export(path, polytope):
+    """Writes a polytope in the format given by the path's extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"cannot export to {extension or 'files without an extension'}; "
+                         f"use one of {', '.join(WRITERS)}")
+    WRITERS[extension](path, polytope)
@@ -14,9 +14,19 @@ class DiagramEditor(QWidget):
     a CoxeterDiagram object.
      - diagramChanged is emitted whenever any values are changed.
      - diagramConfirmed is emitted only when the confirm button is clicked.
+
+    Each node also has a slider setting how far the start point lies from its mirror.
+    Moving one emits seedChanged with the diagram and the list of slider values.
+
+    Diagrams whose group is neither finite, affine nor hyperbolic cannot be confirmed,
+    and a warning is shown for polytopes with more than `vertex_warning` vertices.
      """
     diagramChanged = QtCore.pyqtSignal(CoxeterDiagram)
     diagramConfirmed = QtCore.pyqtSignal(CoxeterDiagram)
+    seedChanged = QtCore.pyqtSignal(CoxeterDiagram, list)
+
+    seed_resolution = 100
+    vertex_warning = 100_000
 
     def __init__(self):
         super().__init__()
@@ -24,18 +34,22 @@ class DiagramEditor(QWidget):
         self.length = 3
         self.node_widgets = []
         self.angle_widgets = []
+        self.seed_widgets = []
 
         self.init_ui()
 
         self.node_widgets[0].setChecked(True)
+        self.seed_widgets[0].setValue(self.seed_resolution)
         self.angle_widgets[0].setValue(4)
 
         self.diagram_renderer.set_diagram(self.diagram())
+        self.show_analysis(self.diagram())
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout()
         self.button_layout = QtWidgets.QHBoxLayout()
         self.button_layout.addStretch(1)
+        self.seed_layout = QtWidgets.QHBoxLayout()
 
         self.diagram_renderer = DiagramRenderer()
 
@@ -57,16 +71,20 @@ class DiagramEditor(QWidget):
         self.add_node_widget()
 
         # Confirm button
-        confirm = QPushButton("Confirm")
-        confirm.clicked.connect(lambda: self.diagramConfirmed.emit(self.diagram()))
+        self.confirm = QPushButton("Confirm")
+        self.confirm.clicked.connect(lambda: self.diagramConfirmed.emit(self.diagram()))
+        self.status = QtWidgets.QLabel()
 
         self.diagram_renderer.set_diagram(self.diagram())
         self.diagramChanged.connect(self.diagram_renderer.set_diagram)
+        self.diagramChanged.connect(self.show_analysis)
 
         layout.addWidget(self.diagram_renderer)
         layout.addWidget(self.sl)
         layout.addLayout(self.button_layout)
-        layout.addWidget(confirm)
+        layout.addLayout(self.seed_layout)
+        layout.addWidget(self.status)
+        layout.addWidget(self.confirm)
         layout.addStretch(1)
         self.setLayout(layout)
 
@@ -84,14 +102,58 @@ class DiagramEditor(QWidget):
     def add_node_widget(self):
         toggle = QPushButton()
         toggle.setCheckable(True)
-        toggle.clicked.connect(lambda: self.diagramChanged.emit(self.diagram()))
         toggle.setStyleSheet("QPushButton { background-color: rgb(200,200,200) }")
         self.node_widgets.append(toggle)
         self.button_layout.insertWidget(self.button_layout.count() - 1, toggle)
 
+        seed = QSlider(Qt.Vertical)
+        seed.setMaximum(self.seed_resolution)
+        self.seed_widgets.append(seed)
+        self.seed_layout.addWidget(seed)
+
+        toggle.clicked.connect(lambda checked: self.toggle_node(toggle, seed, checked))
+        seed.valueChanged.connect(lambda value: self.move_seed(toggle, value))
+
     def remove_node_widget(self):
         toggle = self.node_widgets.pop(-1)
         toggle.deleteLater()
+        seed = self.seed_widgets.pop(-1)
+        seed.deleteLater()
+
+    def toggle_node(self, toggle, seed, checked):
+        # Keep the slider in step without emitting a seed change
+        seed.blockSignals(True)
+        seed.setValue(self.seed_resolution if checked else 0)
+        seed.blockSignals(False)
+        self.diagramChanged.emit(self.diagram())
+
+    def move_seed(self, toggle, value):
+        if toggle.isChecked() != (value > 0):
+            toggle.setChecked(value > 0)
+            self.diagramChanged.emit(self.diagram())
+        # Seeds reuse the group's elements, so they need a finite group
+        if self.diagram().analyse().finite:
+            self.seedChanged.emit(self.diagram(), self.seed())
+
+    def show_analysis(self, diagram):
+        """Describes the diagram's group. Only finite groups and those that tile Euclidean
+        or hyperbolic space can be confirmed."""
+        analysis = diagram.analyse()
+        self.confirm.setEnabled(analysis.geometry in ('spherical', 'affine', 'hyperbolic'))
+        if not analysis.finite:
+            if self.confirm.isEnabled():
+                self.status.setText(f"The group is {analysis.geometry}, so only part of its tiling is shown")
+            else:
+                self.status.setText(f"The group is {analysis.geometry}, so it cannot be drawn")
+            return
+        text = f"{' x '.join(analysis.factors)}: {analysis.vertex_count} vertices"
+        if analysis.vertex_count > self.vertex_warning:
+            text += " (this may take a while)"
+        self.status.setText(text)
+
+    def seed(self):
+        """Returns the start point's distance from each mirror, between 0 and 1"""
+        return [s.value() / self.seed_resolution for s in self.seed_widgets]
 
     def add_angle_widget(self):
         spinbox = QSpinBox()
@@ -13,6 +13,7 @@ class MainWindow(QWidget):
         self.renderer = Renderer(self.diagram_editor.diagram())
 
         self.diagram_editor.diagramConfirmed.connect(self.renderer.set_diagram)
+        self.diagram_editor.seedChanged.connect(self.renderer.set_seed)
 
         self.angle_widget = AngleWidget()
         self.angle_widget.rotorsChanged.connect(self.renderer.set_rotors)
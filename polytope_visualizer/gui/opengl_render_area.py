@@ -43,6 +43,12 @@ class LineRenderer:
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.VBO)
         gl.glBufferData(gl.GL_ARRAY_BUFFER, len(self.vertices) * 4, self.vertices, gl.GL_STATIC_DRAW)
 
+    def set_lines(self, segments):
+        """Replaces every line at once with an (L, 2, 3) array of line ends"""
+        self.vertices = np.ascontiguousarray(segments, np.float32).reshape(-1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.VBO)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, gl.GL_STATIC_DRAW)
+
     def clear_lines(self):
         self.vertices = np.array([], np.float32)
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.VBO)
@@ -171,10 +177,10 @@ class OpenGLRenderArea(QtWidgets.QOpenGLWidget):
         self.update()
 
     def set_edges(self, edges):
+        """Draws a line for each row of an (E, 2) array of indices into the points"""
         self.edges = edges
-        self.line_renderer.clear_lines()
-        for idx1, idx2 in edges:
-            self.line_renderer.add_line(self.points[idx1], self.points[idx2])
+        points = np.asarray(self.points, np.float32).reshape(-1, 3)
+        self.line_renderer.set_lines(points[edges])
         self.update()
 
     def set_angle(self, index, value):
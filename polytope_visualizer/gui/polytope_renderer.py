@@ -2,33 +2,70 @@ import math
 from functools import partial
 
 from PyQt5 import QtCore
-from PyQt5.QtWidgets import QWidget, QGridLayout, QVBoxLayout, QCheckBox
+from PyQt5.QtWidgets import QApplication, QWidget, QGridLayout, QHBoxLayout, QVBoxLayout, QCheckBox, \
+    QLabel, QProgressBar, QPushButton
 from PyQt5.QtCore import Qt
 
 import numpy as np
 from polytope_visualizer.math.project_down import project_3d
+from polytope_visualizer.math.rotate import RotorChain
 from polytope_visualizer.math.diagram import CoxeterDiagram
+from polytope_visualizer.cache import PolytopeCache
+from polytope_visualizer.math.progress import Budget, CancellationToken
 from .slider import LabelledSlider
 from .opengl_render_area import OpenGLRenderArea
+from .polytope_worker import PolytopeWorker
 
 
 class Renderer(QWidget):
+    """Draws the polytope of a diagram.
+
+    Polytopes are generated on a worker thread. The current polytope keeps rendering until
+    the new one arrives, and only the most recently requested diagram is ever shown.
+    Requesting a new diagram cancels the generation of the previous one. Seed changes are
+    worked out on the same thread, one at a time, and only the latest seed waiting is
+    sent on, so dragging a slider never queues up stale work."""
+    polytopeRequested = QtCore.pyqtSignal(object, object)
+    seedRequested = QtCore.pyqtSignal(object, object)
+
+    # Generation gives up rather than exhaust memory on huge diagrams
+    budget = Budget(max_elements=5_000_000, max_bytes=2 * 2**30)
+
     def __init__(self, diagram: CoxeterDiagram):
         super().__init__()
-        # self.iterations = 10
-        #
-        self.diagram = diagram
-        self.points, self.edges = diagram.polytope()
+        self.diagram = None
+        self.requested_diagram = None
+        self.token = None
+        # The seed waiting for the worker to finish the one it is on, if any
+        self.pending_seed = None
+        self.seeding = False
+        self.points = np.empty((0, diagram.dimension))
+        self.edges = np.empty((0, 2), np.int32)
+
+        self.worker_thread = QtCore.QThread()
+        # Single precision is plenty for drawing
+        self.worker = PolytopeWorker(PolytopeCache(), self.budget, np.float32)
+        self.worker.moveToThread(self.worker_thread)
+        self.polytopeRequested.connect(self.worker.generate)
+        self.seedRequested.connect(self.worker.seed)
+        self.worker.finished.connect(self.swap_polytope)
+        self.worker.seeded.connect(self.swap_seed)
+        self.worker.failed.connect(self.generation_failed)
+        self.worker.progress.connect(self.show_progress)
+        self.worker_thread.start()
+        QApplication.instance().aboutToQuit.connect(self.stop_worker)
+
         self.width = 600
         self.height = 600
 
-        self.rotors = []
+        self.rotors = RotorChain()
 
         self.canvas = OpenGLRenderArea()
         self.canvas.setFixedWidth(self.width)
         self.canvas.setFixedHeight(self.height)
         self.canvas.show()
         self.init_ui()
+        self.set_diagram(diagram)
 
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.draw_polytope)
@@ -40,6 +77,22 @@ class Renderer(QWidget):
 
         vlayout.addWidget(self.canvas)
 
+        # Progress of the polytope being generated
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        # Why the last generation failed, in place of the progress bar
+        self.error_label = QLabel()
+        self.error_label.setWordWrap(True)
+        self.error_label.setStyleSheet("color: rgb(170, 0, 0)")
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_button)
+        progress_layout.addWidget(self.error_label)
+        vlayout.addLayout(progress_layout)
+        self.hide_progress()
+        self.error_label.hide()
+
         for i in range(3):
             angle_slider = LabelledSlider("Angle", Qt.Horizontal)
             angle_slider.sl.setMinimum(0)
@@ -84,27 +137,101 @@ class Renderer(QWidget):
         self.setLayout(vlayout)
 
     def draw_polytope(self):
-        rotated_points = self.points
-
+        # Nothing to draw until the first polytope arrives
+        if len(self.points) == 0:
+            return
         # Do pre-projection rotations here
-        for r in self.rotors:
-            try:
-                rotated_points = r.rotate(rotated_points)
-            except IndexError:
-                pass
+        rotated_points = self.rotors.rotate(self.points)
 
         # Post-projection rotations happen in 3d
-        proj_points = np.copy(rotated_points)
-        proj_points = project_3d(proj_points)
+        proj_points = project_3d(rotated_points)
 
-        norm = np.linalg.norm(proj_points[0])
+        # Tilings are centred on their start point, so scale by the farthest point instead
+        norm = np.linalg.norm(proj_points, axis=1).max()
 
         self.canvas.set_points(self.canvas.scaling * proj_points / norm)
         self.canvas.set_edges(self.edges)
 
     def set_diagram(self, diagram: CoxeterDiagram):
+        """Starts generating the polytope of a diagram in the background"""
+        self.cancel()
+        # A new diagram replaces any seed still waiting to be sent
+        self.pending_seed = None
+        self.requested_diagram = diagram
+        self.token = CancellationToken()
+        self.polytopeRequested.emit(diagram, self.token)
+
+        # Busy until the first report says how far along it is
+        self.error_label.hide()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat("generating...")
+        self.progress_bar.show()
+        self.cancel_button.show()
+
+    def cancel(self):
+        if self.token is not None:
+            self.token.cancel()
+
+    def show_progress(self, diagram, report):
+        if diagram is not self.requested_diagram:
+            return
+        if report.estimated_total:
+            self.progress_bar.setRange(0, report.estimated_total)
+            self.progress_bar.setValue(min(report.found, report.estimated_total))
+        else:
+            self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat(f"{report.stage}: {report.found} found, {report.frontier} in frontier")
+
+    def hide_progress(self):
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+
+    def swap_polytope(self, diagram, polytope):
+        # Drop results for diagrams that have since been replaced
+        if diagram is not self.requested_diagram:
+            return
+        self.hide_progress()
         self.diagram = diagram
-        self.points, self.edges = diagram.polytope()
+        self.points, self.edges = polytope.vertices, polytope.edges
+
+    def generation_failed(self, diagram, message):
+        if diagram is self.requested_diagram:
+            self.hide_progress()
+            self.error_label.setText(f"Could not generate the polytope: {message}")
+            self.error_label.show()
+
+    def stop_worker(self):
+        self.cancel()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+
+    def set_seed(self, diagram: CoxeterDiagram, activation_values):
+        """Reshapes the polytope for a new start point, reusing the diagram's group"""
+        # With every value at zero there is no start point to reflect
+        if not any(activation_values):
+            return
+        # A pending background result would undo the new seed
+        self.cancel()
+        self.hide_progress()
+        self.pending_seed = (diagram, activation_values)
+        if not self.seeding:
+            self.request_seed()
+
+    def request_seed(self):
+        diagram, activation_values = self.pending_seed
+        self.pending_seed = None
+        self.seeding = True
+        self.requested_diagram = diagram
+        self.seedRequested.emit(diagram, activation_values)
+
+    def swap_seed(self, diagram, polytope):
+        self.seeding = False
+        if polytope is not None and diagram is self.requested_diagram:
+            self.error_label.hide()
+            self.diagram = diagram
+            self.points, self.edges = polytope.vertices, polytope.edges
+        if self.pending_seed is not None:
+            self.request_seed()
 
     def set_rotors(self, rotors):
-        self.rotors = rotors
+        self.rotors.set_rotors(rotors)
@@ -0,0 +1,59 @@
+import numpy as np
+from PyQt5 import QtCore
+
+from polytope_visualizer.cache import PolytopeCache
+from polytope_visualizer.math.progress import Budget, CancellationToken
+
+
+class PolytopeWorker(QtCore.QObject):
+    """Generates polytopes away from the GUI thread.
+
+    Move the worker to a QThread and connect a signal to generate(). Each result comes
+    back through finished, or failed if generation raised or was cancelled, together with
+    the diagram it was generated for. ProgressReports arrive through progress meanwhile.
+    Polytopes reshaped by seed() come back through seeded, with None if that failed.
+
+    Diagrams with infinite groups give the part of their tiling within `tiling_radius`
+    of the start point, which is measured in edge lengths for affine tilings and in
+    hyperbolic distance for hyperbolic ones."""
+    finished = QtCore.pyqtSignal(object, object)
+    failed = QtCore.pyqtSignal(object, str)
+    progress = QtCore.pyqtSignal(object, object)
+    seeded = QtCore.pyqtSignal(object, object)
+
+    tiling_radius = {'affine': 20, 'hyperbolic': 6}
+
+    def __init__(self, cache: PolytopeCache, budget: Budget = None, dtype=np.float64):
+        super().__init__()
+        self.cache = cache
+        self.budget = budget
+        # The precision of the vertices handed back
+        self.dtype = dtype
+
+    @QtCore.pyqtSlot(object, object)
+    def generate(self, diagram, token: CancellationToken):
+        def progress(report):
+            self.progress.emit(diagram, report)
+
+        try:
+            geometry = diagram.analyse().geometry
+            if geometry in self.tiling_radius:
+                polytope = diagram.tiling(self.tiling_radius[geometry], token=token,
+                                          budget=self.budget, progress=progress).astype(self.dtype)
+            else:
+                polytope = self.cache.polytope(diagram, self.dtype, token=token, budget=self.budget,
+                                               progress=progress)
+        except Exception as e:
+            self.failed.emit(diagram, str(e))
+            return
+        self.finished.emit(diagram, polytope)
+
+    @QtCore.pyqtSlot(object, object)
+    def seed(self, diagram, activation_values):
+        """Reshapes the polytope for a new start point, with its edges only"""
+        try:
+            polytope = diagram.seeded_polytope(activation_values, faces=False).astype(self.dtype)
+        except Exception as e:
+            self.failed.emit(diagram, str(e))
+            polytope = None
+        self.seeded.emit(diagram, polytope)
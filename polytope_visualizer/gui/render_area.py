@@ -3,8 +3,8 @@ from PyQt5.QtWidgets import QFrame
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPainter
 
-from polytope_visualizer.math.project_down import v_project
-from polytope_visualizer.math.rotate import v_rotate
+from polytope_visualizer.math.project_down import project_points
+from polytope_visualizer.math.rotate import rotate_points
 
 import math
 
@@ -56,11 +56,11 @@ class RenderArea(QFrame):
         self.projected_points = self._project_points(self.points)
 
     def _project_points(self, points):
-        proj_points = v_rotate(points, float(math.radians(self.angles_3d[0])), 0, 1)
-        proj_points = v_rotate(proj_points, float(math.radians(self.angles_3d[1])), 0, 2)
-        proj_points = v_rotate(proj_points, float(math.radians(self.angles_3d[2])), 1, 2)
+        proj_points = rotate_points(points, math.radians(self.angles_3d[0]), 0, 1)
+        proj_points = rotate_points(proj_points, math.radians(self.angles_3d[1]), 0, 2)
+        proj_points = rotate_points(proj_points, math.radians(self.angles_3d[2]), 1, 2)
 
-        proj_points, heights = v_project(proj_points, self.screen_dist, self.eye_dist)
+        proj_points, heights = project_points(proj_points, self.screen_dist, self.eye_dist)
 
         heights = np.reshape(heights, (-1, 1))
         heights *= self.dot_size
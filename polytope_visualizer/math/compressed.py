@@ -0,0 +1,142 @@
+import numpy as np
+
+from .wythoff import fundamental_edges, orbit_edges, wythoff_faces, FaceLattice
+
+
+def _index_dtype(count):
+    """Returns the smallest unsigned type that can index `count` items"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if count <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.int64
+
+
+def spanning_tree(permutations):
+    """Returns a breadth-first spanning tree of the vertices from the start vertex, as the
+    parent of each vertex and the mirror reflecting the parent onto it"""
+    count, mirrors = permutations.shape
+    parent = np.full(count, -1, np.int64)
+    generator = np.full(count, -1, np.int64)
+    parent[0] = 0
+    frontier = np.zeros(1, np.int64)
+    while frontier.shape[0]:
+        images = permutations[frontier].ravel().astype(np.int64)
+        sources = np.repeat(frontier, mirrors)
+        new = parent[images] < 0
+        images, first = np.unique(images[new], return_index=True)
+        parent[images] = sources[new][first]
+        generator[images] = np.flatnonzero(new)[first] % mirrors
+        frontier = images
+    return parent, generator
+
+
+class LazyVertices:
+    """The vertices of a CompressedPolytope, computed only for the rows that are indexed.
+
+    Each vertex is found by reflecting the start point along its path in the spanning
+    tree, so indexing a slice costs time proportional to its length and nothing is kept."""
+    def __init__(self, polytope):
+        self._polytope = polytope
+
+    def __len__(self):
+        return self._polytope.permutations.shape[0]
+
+    @property
+    def shape(self):
+        return len(self), self._polytope.dimension
+
+    def __getitem__(self, key):
+        indices = np.arange(len(self))[key]
+        return self._polytope._points(np.atleast_1d(indices)).reshape(np.shape(indices) + (-1,))
+
+    def __array__(self, dtype=None, copy=None):
+        points = self[:]
+        return points if dtype is None else points.astype(dtype)
+
+
+class CompressedPolytope:
+    """A Wythoffian polytope stored through its symmetry alone.
+
+    Only the mirrors' permutation table of the vertices is kept, in the smallest integer
+    type that fits, together with the diagram it came from. Vertices are computed for just
+    the rows that are indexed. Edges and faces are not lazy per slice: they are numbered
+    by a BFS over their orbits, so the first access to either expands the whole array
+    from its orbit representatives and keeps it. Only the stored fields are pickled."""
+    __slots__ = ('coxeter_matrix', 'ringed', 'normals', 'start_point', 'permutations',
+                 '_tree', '_edges', '_faces', '_lattice')
+
+    def __init__(self, coxeter_matrix, ringed, normals, start_point, permutations):
+        self.coxeter_matrix = np.asarray(coxeter_matrix, np.int64)
+        self.ringed = [bool(r) for r in ringed]
+        self.normals = np.asarray(normals)
+        self.start_point = np.asarray(start_point)
+        self.permutations = np.ascontiguousarray(permutations, _index_dtype(len(permutations)))
+        self._tree = self._edges = self._faces = self._lattice = None
+
+    def __getstate__(self):
+        return self.coxeter_matrix, self.ringed, self.normals, self.start_point, self.permutations
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @property
+    def dimension(self):
+        return self.start_point.shape[0]
+
+    @property
+    def nbytes(self):
+        """The bytes taken by the stored fields"""
+        return (self.coxeter_matrix.nbytes + self.normals.nbytes + self.start_point.nbytes
+                + self.permutations.nbytes)
+
+    def _points(self, indices):
+        if self._tree is None:
+            self._tree = spanning_tree(self.permutations)
+        parent, generator = self._tree
+
+        # Walk every index up to the start vertex, then reflect back down
+        steps = []
+        current = indices.astype(np.int64)
+        while np.any(current):
+            steps.append(np.where(current != 0, generator[current], -1))
+            current = parent[current]
+
+        points = np.tile(self.start_point, (indices.shape[0], 1))
+        for mirrors in reversed(steps):
+            moved = mirrors >= 0
+            normals = self.normals[mirrors[moved]]
+            dots = np.sum(points[moved] * normals, axis=1)
+            points[moved] -= 2 * dots[:, np.newaxis] * normals
+        return points
+
+    @property
+    def vertices(self):
+        return LazyVertices(self)
+
+    @property
+    def edges(self):
+        """Every edge, expanded in full on first access and kept"""
+        if self._edges is None:
+            self._edges = orbit_edges(self.permutations, fundamental_edges(self.permutations))
+        return self._edges
+
+    @property
+    def faces(self):
+        """Every face, expanded in full on first access and kept"""
+        if self._faces is None:
+            self._faces = wythoff_faces(self.permutations)
+        return self._faces
+
+    @property
+    def lattice(self):
+        if self._lattice is None:
+            self._lattice = FaceLattice(self.permutations, self.coxeter_matrix, self.ringed)
+        return self._lattice
+
+    def face_count(self):
+        return self.faces[0].shape[0] - 1
+
+    def face(self, idx):
+        """Returns the cycle of vertex indices around a face"""
+        offsets, indices = self.faces
+        return indices[offsets[idx]:offsets[idx + 1]]
@@ -0,0 +1,183 @@
+import numpy as np
+
+from .progress import report, count
+
+
+class CosetTable:
+    """The action of a Coxeter group's generators on the cosets of a subgroup.
+
+    `table[c, i]` is the coset reached from coset `c` by generator `i`. Coset 0 is the
+    subgroup itself and the rest are numbered in breadth-first order, so coset `c` is
+    coset `parent[c]` multiplied by generator `generator[c]`."""
+    def __init__(self, table, parent, generator):
+        self.table = table
+        self.parent = parent
+        self.generator = generator
+
+    def __len__(self):
+        return self.table.shape[0]
+
+    def depths(self):
+        """Returns the length of the shortest word reaching each coset"""
+        depth = np.zeros(len(self), np.int32)
+        for c in range(1, len(self)):
+            depth[c] = depth[self.parent[c]] + 1
+        return depth
+
+
+def coxeter_relators(coxeter_matrix):
+    """Returns the relators (s_i s_j)^m for each pair of generators.
+
+    The relators s_i^2 are not listed since the coset table treats every generator as an
+    involution. Entries below 2 (such as 0 for an infinite order) impose no relation."""
+    relators = []
+    n = len(coxeter_matrix)
+    for i in range(n):
+        for j in range(i + 1, n):
+            m = int(coxeter_matrix[i][j])
+            if m >= 2:
+                relators.append((i, j) * m)
+    return relators
+
+
+def enumerate_cosets(coxeter_matrix, subgroup=(), max_cosets=1 << 22, monitor=None, expected=None):
+    """Runs a Todd–Coxeter (HLT) enumeration of the cosets of a subgroup.
+
+    `subgroup` lists the subgroup's generators, each either a generator index or a word of
+    generator indices. With no subgroup the cosets are the group elements themselves.
+    Raises a RuntimeError if more than `max_cosets` cosets are ever defined, which happens
+    when the group is infinite or the subgroup has too large an index. Progress goes to
+    the optional Monitor every 1024 cosets, against the `expected` number of cosets if it
+    is known."""
+    n = len(coxeter_matrix)
+    relators = coxeter_relators(coxeter_matrix)
+    subgroup_words = [(w,) if np.ndim(w) == 0 else tuple(w) for w in subgroup]
+
+    # Rows of the table are cosets, columns are generators and -1 marks an unknown entry.
+    # Generators are involutions, so table[c][x] == d always comes with table[d][x] == c.
+    table = [[-1] * n]
+    # forward[c] == c for live cosets, otherwise it points towards the coset c merged into
+    forward = [0]
+
+    def define(c, x):
+        if len(table) >= max_cosets:
+            raise RuntimeError(f"coset enumeration exceeded {max_cosets} cosets")
+        d = len(table)
+        table.append([-1] * n)
+        forward.append(d)
+        table[c][x] = d
+        table[d][x] = c
+
+    def rep(c):
+        r = c
+        while forward[r] != r:
+            r = forward[r]
+        # Path compression
+        while forward[c] != r:
+            forward[c], c = r, forward[c]
+        return r
+
+    def merge(a, b, queue):
+        a, b = rep(a), rep(b)
+        if a != b:
+            if a > b:
+                a, b = b, a
+            forward[b] = a
+            queue.append(b)
+
+    def coincidence(a, b):
+        queue = []
+        merge(a, b, queue)
+        k = 0
+        while k < len(queue):
+            dead = queue[k]
+            k += 1
+            row = table[dead]
+            for x in range(n):
+                d = row[x]
+                if d < 0:
+                    continue
+                table[d][x] = -1
+                mu, nu = rep(dead), rep(d)
+                if table[mu][x] >= 0:
+                    merge(nu, table[mu][x], queue)
+                elif table[nu][x] >= 0:
+                    merge(mu, table[nu][x], queue)
+                else:
+                    table[mu][x] = nu
+                    table[nu][x] = mu
+
+    def scan_and_fill(c, word):
+        f, b = c, c
+        i, j = 0, len(word) - 1
+        while True:
+            # Scan forwards from the start of the word
+            while i <= j and table[f][word[i]] >= 0:
+                f = table[f][word[i]]
+                i += 1
+            if i > j:
+                if f != b:
+                    coincidence(f, b)
+                return
+            # Scan backwards from the end of the word
+            while j >= i and table[b][word[j]] >= 0:
+                b = table[b][word[j]]
+                j -= 1
+            if j < i:
+                coincidence(f, b)
+                return
+            if i == j:
+                # The scan closes up with a deduction
+                table[f][word[i]] = b
+                table[b][word[i]] = f
+                return
+            define(f, word[i])
+
+    for word in subgroup_words:
+        scan_and_fill(0, word)
+
+    c = 0
+    while c < len(table):
+        if c & 1023 == 0:
+            # Each row costs a list of n references plus the list itself
+            report(monitor, 'cosets', len(table), len(table) - c, estimated_total=expected,
+                   nbytes=len(table) * (8 * n + 64))
+        for relator in relators:
+            if forward[c] != c:
+                break
+            scan_and_fill(c, relator)
+        if forward[c] == c:
+            row = table[c]
+            for x in range(n):
+                if row[x] < 0:
+                    define(c, x)
+        c += 1
+
+    # Every coset defined and later merged away was a duplicate
+    count(monitor, defined=len(table), duplicates=sum(forward[c] != c for c in range(len(table))))
+    return _standardize(table, rep, n)
+
+
+def _standardize(table, rep, n):
+    """Renumbers the live cosets in breadth-first order from the subgroup"""
+    index = [-1] * len(table)
+    index[0] = 0
+    order = [0]
+    parent = [-1]
+    generator = [-1]
+    k = 0
+    while k < len(order):
+        c = order[k]
+        for x in range(n):
+            d = rep(table[c][x])
+            if index[d] < 0:
+                index[d] = len(order)
+                order.append(d)
+                parent.append(k)
+                generator.append(x)
+        k += 1
+
+    result = np.array([[index[rep(table[c][x])] for x in range(n)] for c in order], np.int32)
+    return CosetTable(result.reshape(len(order), n),
+                      np.array(parent, np.int32),
+                      np.array(generator, np.int32))
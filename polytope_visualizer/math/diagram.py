@@ -1,16 +1,80 @@
-from typing import List
+import logging
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence
 import numpy as np
-from scipy.spatial import KDTree
 
-from ..math.utils import get_axis_vector
+from .compressed import CompressedPolytope
+from .coset import enumerate_cosets
+from .exact import exact_orbit, to_cartesian
+from .groups import coxeter_matrix, linear_matrix, gram_matrix, geometry, classify, group_order, orbit_size, \
+    parse_diagram
+from .progress import Monitor, report, count
+from .stats import GenerationStats
+from .tiling import TilingSpace, stream_tiling
+from .vertex_index import VertexIndex
+from .wythoff import vertex_permutations, fundamental_edges, orbit_edges, wythoff_faces, FaceLattice
+
+logger = logging.getLogger(__name__)
+
+
+def _contiguous(array, dtype):
+    """Returns the array itself if it is already contiguous and of the right type, which
+    keeps memory-mapped arrays mapped, and a contiguous copy otherwise"""
+    array = np.asanyarray(array)
+    if array.dtype == dtype and array.flags.c_contiguous:
+        return array
+    return np.ascontiguousarray(array, dtype)
 
 
 class Polytope:
-    def __init__(self, dimension: int = 3):
-        self.dimension = dimension
-        self.vertices = []
-        self.edges = []
-        self.faces = []
+    """The vertices, edges and faces of a polytope as flat arrays.
+
+    Vertices are a contiguous (V, d) float array, in float64 unless another precision is
+    asked for, and edges an (E, 2) int32 array of vertex indices. Faces are packed as
+    (offsets, indices), where face f is indices[offsets[f]:offsets[f + 1]]."""
+    __slots__ = ('vertices', 'edges', 'faces', 'lattice')
+
+    def __init__(self, vertices, edges=None, faces=None, lattice=None, dtype=np.float64):
+        self.vertices = _contiguous(vertices, dtype)
+        if edges is None:
+            edges = np.empty((0, 2), np.int32)
+        self.edges = _contiguous(edges, np.int32)
+        if self.edges.shape[1:] != (2,):
+            self.edges = self.edges.reshape(-1, 2)
+        if faces is None:
+            faces = (np.zeros(1, np.int64), np.empty(0, np.int32))
+        self.faces = (_contiguous(faces[0], np.int64), _contiguous(faces[1], np.int32))
+        # Faces of every rank, enumerated on demand
+        self.lattice = lattice
+
+    @property
+    def dimension(self):
+        return self.vertices.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.vertices.nbytes + self.edges.nbytes + self.faces[0].nbytes + self.faces[1].nbytes
+
+    def astype(self, dtype):
+        """Returns the polytope with its vertices in another precision. The other arrays
+        are shared."""
+        if self.vertices.dtype == dtype:
+            return self
+        return Polytope(self.vertices, self.edges, self.faces, self.lattice, dtype)
+
+    def face_count(self):
+        return self.faces[0].shape[0] - 1
+
+    def face(self, idx):
+        """Returns the cycle of vertex indices around a face"""
+        offsets, indices = self.faces
+        return indices[offsets[idx]:offsets[idx + 1]]
+
+    def segments(self):
+        """Returns the ends of every edge as an (E, 2, d) array, ready to upload as lines"""
+        return self.vertices[self.edges]
 
 
 class ReflectionSequence:
@@ -43,19 +107,12 @@ class ReflectionSequence:
 
 def _generate_start_point(normals, activation_values):
     """Places a point that is on each of the deactivated mirrors and
-    off the activated mirrors"""
-
-    # Find intersections of planes where each intersection is a vector
-    intersections = np.empty(normals.shape)
-    for idx in range(normals.shape[0]):
-        intersections[idx] = get_axis_vector(idx, normals)
-
-    # Flip intersection vectors so that they all point in the same direction
-    for idx in range(1, intersections.shape[0]):
-        if np.dot(intersections[idx], intersections[idx-1]) < 0:
-            intersections[idx] *= -1
+    off the activated mirrors.
 
-    v = np.matmul(intersections.T, activation_values)
+    The point is at a distance from each mirror proportional to its activation value,
+    so every edge of the resulting polytope has the same length when the values are
+    all 0 or 1."""
+    v = np.linalg.solve(normals, np.asarray(activation_values, float))
     return v / np.linalg.norm(v)
 
 
@@ -64,106 +121,588 @@ def normal_reflection(point, normal):
     return point - 2 * np.dot(point, normal) * normal
 
 
+def batch_reflection(points, normals):
+    """Reflect each of F points through each of n mirrors, giving an (F, n, d) array"""
+    dots = np.matmul(points, normals.T)
+    return points[:, np.newaxis, :] - 2 * dots[:, :, np.newaxis] * normals[np.newaxis, :, :]
+
+
+def frontier_orbit(normals, generic_point, start_point, monitor=None):
+    """Enumerates the symmetry group one BFS level at a time.
+
+    The whole frontier of generic points is reflected through every mirror at once and
+    deduplicated in bulk. The start point is carried along, so the result is its image
+    under each group element together with the table of where each mirror sends each
+    element. Progress goes to the optional Monitor once per level."""
+    dimension = generic_point.shape[0]
+    index = VertexIndex(dimension)
+    index.add(generic_point)
+
+    frontier = generic_point.reshape(1, -1)
+    start_frontier = start_point.reshape(1, -1)
+    points = [start_frontier]
+    table = []
+
+    while frontier.shape[0]:
+        reflected = batch_reflection(frontier, normals).reshape(-1, dimension)
+        indices, is_new = index.add_many(reflected)
+        table.append(indices.reshape(-1, len(normals)))
+
+        # New elements are numbered consecutively, so the next level's rows follow on
+        frontier = reflected[is_new]
+        start_frontier = batch_reflection(start_frontier, normals).reshape(-1, dimension)[is_new]
+        points.append(start_frontier)
+        report(monitor, 'group', len(index), frontier.shape[0],
+               nbytes=len(index) * (16 * dimension + 4 * len(normals)))
+        count(monitor, frontier.shape[0], lookups=reflected.shape[0],
+              duplicates=reflected.shape[0] - frontier.shape[0])
+
+    return np.concatenate(points), np.concatenate(table).astype(np.int32)
+
+
+def vertex_orbit(normals, start_point, monitor=None, size=None):
+    """Enumerates the orbit of the start point directly, one BFS level at a time.
+
+    Returns the vertices, with the start point first, and an (V, n) int32 array whose
+    column i is the permutation of the vertices induced by mirror i. Only vertices are
+    stored, so the work grows with the size of the orbit rather than the order of the
+    group. When the orbit's `size` is known its arrays are allocated up front. Progress
+    goes to the optional Monitor once per level."""
+    dimension, mirror_count = start_point.shape[0], normals.shape[0]
+    index = VertexIndex(dimension, capacity=size or 16)
+    index.add(start_point)
+
+    frontier = start_point.reshape(1, -1)
+    table = np.empty((size or 16, mirror_count), np.int32)
+    rows = 0
+    while frontier.shape[0]:
+        reflected = batch_reflection(frontier, normals).reshape(-1, dimension)
+        indices, is_new = index.add_many(reflected)
+        # The frontier's vertices are numbered consecutively after every earlier level
+        if rows + frontier.shape[0] > table.shape[0]:
+            grown = max(2 * table.shape[0], rows + frontier.shape[0])
+            table = np.concatenate((table, np.empty((grown - table.shape[0], mirror_count), np.int32)))
+        table[rows:rows + frontier.shape[0]] = indices.reshape(-1, mirror_count)
+        rows += frontier.shape[0]
+        frontier = reflected[is_new]
+        report(monitor, 'vertices', len(index), frontier.shape[0], estimated_total=size,
+               nbytes=len(index) * (8 * dimension + 4 * mirror_count))
+        count(monitor, frontier.shape[0], lookups=reflected.shape[0],
+              duplicates=reflected.shape[0] - frontier.shape[0])
+
+    return index.points.copy(), table[:rows]
+
+
+def stream_polytope(normals, start_point, monitor=None):
+    """Generates a polytope one BFS level of its vertex orbit at a time.
+
+    Yields (vertices, edges) pairs: the vertices found at that level, numbered on from the
+    previous chunks, and the edges whose ends are both known by then, each edge exactly
+    once. Only the vertex index and the mirrors' action on the vertices are kept between
+    levels."""
+    dimension, mirror_count = start_point.shape[0], normals.shape[0]
+    index = VertexIndex(dimension)
+    index.add(start_point)
+    yield start_point.reshape(1, -1), np.empty((0, 2), np.int32)
+
+    def pack(pairs):
+        pairs = np.sort(pairs, axis=1).astype(np.int64)
+        return (pairs[:, 0] << 32) | pairs[:, 1]
+
+    frontier = start_point.reshape(1, -1)
+    table = np.empty((0, mirror_count), np.int64)
+    visited = None
+    pending = np.empty((0, 2), np.int64)
+
+    while frontier.shape[0]:
+        reflected = batch_reflection(frontier, normals).reshape(-1, dimension)
+        indices, is_new = index.add_many(reflected)
+        # The frontier's vertices are numbered consecutively after every earlier level
+        table = np.concatenate((table, indices.reshape(-1, mirror_count)))
+        frontier = reflected[is_new]
+        report(monitor, 'vertices', len(index), frontier.shape[0],
+               nbytes=len(index) * (8 * dimension + 8 * mirror_count))
+        count(monitor, frontier.shape[0], lookups=reflected.shape[0],
+              duplicates=reflected.shape[0] - frontier.shape[0])
+
+        found = [np.empty((0, 2), np.int64)]
+        if visited is None:
+            # Begin with edges between the start point and its images
+            images = table[0][table[0] != 0]
+            pending = np.stack((np.zeros_like(images), images), axis=1)
+            visited = np.unique(pack(pending))
+            found.append(pending)
+
+        # Reflect every edge whose ends have been reflected already
+        while True:
+            ready = np.all(pending < table.shape[0], axis=1)
+            if not ready.any():
+                break
+            images = table[pending[ready]].transpose(0, 2, 1).reshape(-1, 2)
+            pending = pending[~ready]
+            keys = np.unique(pack(images))
+            keys = keys[~np.isin(keys, visited, assume_unique=True)]
+            visited = np.union1d(visited, keys)
+            new_edges = np.stack((keys >> 32, keys & 0xffffffff), axis=1)
+            found.append(new_edges)
+            pending = np.concatenate((pending, new_edges))
+
+        yield frontier, np.concatenate(found).astype(np.int32)
+
+
+def _points_from_cosets(start_point, normals, cosets):
+    """Reflects the start point along the spanning tree of a coset table, giving one point
+    per coset"""
+    points = np.empty((len(cosets), start_point.shape[0]))
+    points[0] = start_point
+    for idx in range(1, len(cosets)):
+        points[idx] = normal_reflection(points[cosets.parent[idx]], normals[cosets.generator[idx]])
+    return points
+
+
 def remove_doubles(points):
     """Remove duplicate points"""
     _, indices = np.unique(np.round(points, 5), axis=0, return_index=True)
     return points[indices]
 
 
-class CoxeterDiagram:
-    """A linear coxeter diagram"""
-    def __init__(self, nodes: List[bool], edges: List[int]) -> None:
-        """Each node is activated (True) or deactivated (False).
-        The value at an edge corresponds to the dihedral angle between the connected nodes."""
-        self.nodes: List[bool] = nodes
-        self.edges: List[int] = edges
+def _read_only(array):
+    array.setflags(write=False)
+    return array
 
-        # A linear diagram of with n nodes can be embedded in n-dimensions
-        self.dimension = len(nodes)
 
-    def mirror_normals(self):
-        """Returns the normal vectors of the mirrors defined"""
-        normals = np.zeros((self.dimension, self.dimension))
+@lru_cache(maxsize=64)
+def _mirror_normals(matrix):
+    """Factors the Gram matrix as N N^T, so row i of the lower triangular N is the normal
+    of mirror i"""
+    try:
+        normals = np.linalg.cholesky(gram_matrix(matrix))
+    except np.linalg.LinAlgError:
+        raise ValueError("the Coxeter group is not finite, so its mirrors cannot be "
+                         "placed in Euclidean space") from None
+    return _read_only(normals)
+
+
+@lru_cache(maxsize=8)
+def _group_matrices(matrix):
+    normals = _mirror_normals(matrix)
+    cosets = enumerate_cosets(matrix)
+    dimension = normals.shape[0]
+    reflections = np.eye(dimension) - 2 * normals[:, :, np.newaxis] * normals[:, np.newaxis, :]
+
+    # Each element is its parent followed by one more reflection, so fill in a level at a time
+    matrices = np.empty((len(cosets), dimension, dimension))
+    matrices[0] = np.eye(dimension)
+    depths = cosets.depths()
+    for depth in range(1, depths.max(initial=0) + 1):
+        idx = np.flatnonzero(depths == depth)
+        matrices[idx] = np.matmul(matrices[cosets.parent[idx]], reflections[cosets.generator[idx]])
+
+    return _read_only(matrices), _read_only(cosets.table)
+
+
+# The most recently generated polytopes, keyed by canonical diagram and backend
+_polytopes = OrderedDict()
+_polytopes_lock = threading.Lock()
+_max_polytopes = 16
+
 
-        # Set the first normal to (1, 0, 0, ...)
-        normals[0][0] = 1
+def _cached_polytope(diagram, backend, monitor):
+    key = (diagram, backend)
+    with _polytopes_lock:
+        if key in _polytopes:
+            _polytopes.move_to_end(key)
+            logger.debug("reusing the cached polytope of %r", diagram)
+            return _polytopes[key]
 
-        for i in range(1, self.dimension):
-            for j in range(i + 1):
-                if j + 2 <= i:
-                    normals[i][j] = 0
-                elif j + 1 <= i:
-                    normals[i][j] = np.cos(np.pi / self.edges[i - 1]) / normals[i - 1][j]
-                else:
-                    normals[i][j] = np.sqrt(1 - np.square(normals[i][j - 1]))
+    # Generate outside the lock so other diagrams can still be looked up meanwhile
+    polytope = diagram._generate(backend, monitor)
+    for array in (polytope.vertices, polytope.edges) + tuple(polytope.faces):
+        _read_only(array)
 
-        return normals
+    with _polytopes_lock:
+        _polytopes[key] = polytope
+        while len(_polytopes) > _max_polytopes:
+            _polytopes.popitem(last=False)
+    return polytope
 
 
-    def find_reflection_sequences(self, normals):
+class DiagramAnalysis(NamedTuple):
+    """What can be told about a diagram's group without enumerating it. The factors, order
+    and vertex count are None unless the group is finite."""
+    geometry: str
+    factors: Optional[list]
+    order: Optional[int]
+    vertex_count: Optional[int]
+
+    @property
+    def finite(self):
+        return self.geometry == 'spherical'
+
+
+class CoxeterDiagram:
+    """A coxeter diagram, described by its Coxeter matrix and which of its nodes are
+    activated.
+
+    Diagrams are immutable and hashable. A diagram and its mirror image (with the nodes
+    numbered in reverse) describe the same polytope, so they compare equal and share a
+    canonical form."""
+    __slots__ = ('_nodes', '_matrix')
+
+    def __init__(self, nodes: Sequence[bool], edges: Sequence[int]) -> None:
+        """Creates a linear diagram. Each node is activated (True) or deactivated (False).
+        The value at an edge corresponds to the dihedral angle between the connected nodes."""
+        if len(edges) != len(nodes) - 1:
+            raise ValueError("a linear diagram has one edge fewer than it has nodes")
+        self._nodes = tuple(nodes)
+        self._matrix = tuple(map(tuple, linear_matrix([int(e) for e in edges]).tolist()))
+
+    @classmethod
+    def from_matrix(cls, nodes: Sequence[bool], matrix) -> 'CoxeterDiagram':
+        """Creates a diagram of any shape from its Coxeter matrix, whose entry (i, j) is
+        the order of the product of the reflections through mirrors i and j, with 0 for
+        infinity."""
+        matrix = np.asarray(matrix, np.int64)
+        if matrix.shape != (len(nodes), len(nodes)):
+            raise ValueError("the Coxeter matrix must have a row and column per node")
+        off_diagonal = ~np.eye(len(nodes), dtype=bool)
+        if (np.any(matrix != matrix.T) or np.any(np.diag(matrix) != 1)
+                or np.any((matrix[off_diagonal] < 2) & (matrix[off_diagonal] != 0))):
+            raise ValueError("not a Coxeter matrix")
+
+        diagram = cls.__new__(cls)
+        diagram._nodes = tuple(nodes)
+        diagram._matrix = tuple(map(tuple, matrix.tolist()))
+        return diagram
+
+    @classmethod
+    def from_group(cls, name: str, nodes: Sequence[bool]) -> 'CoxeterDiagram':
+        """Creates a diagram of a named group such as 'B4' or 'E8', with its nodes
+        numbered as in groups.coxeter_matrix"""
+        return cls.from_matrix(nodes, coxeter_matrix(name))
+
+    @classmethod
+    def parse(cls, text: str) -> 'CoxeterDiagram':
+        """Creates a diagram from a Schläfli symbol, Dynkin string or group name with its
+        rings, as read by groups.parse_diagram"""
+        matrix, nodes = parse_diagram(text)
+        if nodes is None:
+            raise ValueError(f"{text!r} does not say which nodes are ringed")
+        return cls.from_matrix(nodes, matrix)
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    def is_linear(self):
+        """Whether only consecutive nodes are linked"""
+        n = len(self._nodes)
+        return all(self._matrix[i][j] == 2 for i in range(n) for j in range(i + 2, n))
+
+    @property
+    def edges(self):
+        """The labels between consecutive nodes of a linear diagram"""
+        if not self.is_linear():
+            raise ValueError("only a linear diagram has a chain of edges")
+        return tuple(self._matrix[i][i + 1] for i in range(len(self._nodes) - 1))
+
+    @property
+    def dimension(self):
+        # A diagram with n nodes can be embedded in n-dimensions
+        return len(self._nodes)
+
+    def canonical(self):
+        """Returns whichever of this diagram and its mirror image sorts first"""
+        mirrored = self.mirror_image()
+        if (mirrored._nodes, mirrored._matrix) < (self._nodes, self._matrix):
+            return mirrored
+        return self
+
+    def _key(self):
+        canonical = self.canonical()
+        return canonical._nodes, canonical._matrix
+
+    def __eq__(self, other):
+        if not isinstance(other, CoxeterDiagram):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        if self.is_linear():
+            return f"CoxeterDiagram({list(self._nodes)}, {list(self.edges)})"
+        return f"CoxeterDiagram.from_matrix({list(self._nodes)}, {[list(r) for r in self._matrix]})"
+
+    def analyse(self):
+        """Checks whether the group is finite before anything is enumerated. For finite
+        groups this names the irreducible factors and gives the group's order and the
+        number of vertices in closed form."""
+        kind = geometry(self._matrix)
+        if kind != 'spherical':
+            return DiagramAnalysis(kind, None, None, None)
+        return DiagramAnalysis(kind, [name for name, _ in classify(self._matrix)],
+                               group_order(self._matrix), orbit_size(self._matrix, self._nodes))
+
+    def mirror_normals(self):
+        """Returns the normal vectors of the mirrors defined. The result is shared between
+        calls and is read-only. Raises a ValueError if the group is infinite."""
+        return _mirror_normals(self._matrix)
+
+    def coxeter_matrix(self):
+        """Returns the Coxeter matrix, whose entry (i, j) is the order of the product of
+        the reflections through mirrors i and j"""
+        return np.array(self._matrix)
+
+    def group_matrices(self):
+        """Returns every element of the symmetry group as an (|G|, n, n) stack of orthogonal
+        matrices acting on row vectors, together with the group's generator table. Both are
+        shared between diagrams with the same mirrors and are read-only."""
+        return _group_matrices(self._matrix)
+
+    def mirror_image(self):
+        """Returns the diagram with its nodes numbered in reverse"""
+        return CoxeterDiagram.from_matrix(self._nodes[::-1], tuple(row[::-1] for row in self._matrix[::-1]))
+
+    def orient(self, polytope):
+        """Carries a polytope generated from this diagram's canonical form over to this
+        diagram's own mirrors, so it matches seeded_polytope() and iter_polytope().
+
+        Renumbering the nodes in reverse is an isometry between the two sets of mirror
+        normals, so the vertices are only rotated or reflected and keep their order, and
+        the edges and faces are shared."""
+        if self.canonical() is self:
+            return polytope
+        return self._from_mirror_image(polytope)
+
+    def _from_mirror_image(self, polytope):
+        mirror = self.mirror_image()
+        # The orthogonal map taking each of the mirror image's normals to its counterpart here
+        isometry = np.linalg.solve(mirror.mirror_normals()[::-1], self.mirror_normals())
+        lattice = None
+        if polytope.lattice is not None:
+            lattice = FaceLattice(polytope.lattice.permutations[:, ::-1], self.coxeter_matrix(),
+                                  [bool(n) for n in self._nodes])
+        return Polytope(_read_only(np.matmul(polytope.vertices, isometry)), polytope.edges, polytope.faces,
+                        lattice, polytope.vertices.dtype)
+
+    def seeded_polytope(self, activation_values, faces=True):
+        """Returns the polytope generated from a start point at the given (real-valued)
+        distances from each mirror.
+
+        The group is reused from group_matrices(), so changing the seed only costs one
+        batched matrix product and a merge of coincident vertices. Values below a
+        thousandth of the largest are treated as zero so those vertices merge cleanly.
+        Previews that only draw edges can pass faces=False to skip the faces and lattice."""
+        values = np.abs(np.asarray(activation_values, float))
+        values[values < 1e-3 * values.max(initial=0)] = 0
+
+        matrices, table = self.group_matrices()
+        start_point = _generate_start_point(self.mirror_normals(), values)
+        points = np.matmul(start_point, matrices)
+
+        vertices, permutations = vertex_permutations(points, table)
+        edges = orbit_edges(permutations, fundamental_edges(permutations))
+        if not faces:
+            return Polytope(vertices, edges)
+        return Polytope(vertices, edges, wythoff_faces(permutations),
+                        FaceLattice(permutations, self.coxeter_matrix(), [bool(v) for v in values]))
+
+    def compressed_polytope(self, progress=None, token=None, budget=None):
+        """Returns the polytope in its symmetry-compressed form, which stores only the
+        mirrors' permutations of the vertices and expands vertices, edges and faces when
+        they are indexed. See polytope() for the arguments."""
+        # Number the vertices as polytope() does, from the canonical form's cosets, with the
+        # mirrors renumbered back to this diagram's
+        canonical = self.canonical()
+        analysis = canonical.analyse()
+        if not analysis.finite:
+            raise ValueError(f"the diagram's group is {analysis.geometry}, not finite")
+        stabilizer = [idx for idx, n in enumerate(canonical.nodes) if not n]
+        cosets = enumerate_cosets(canonical.coxeter_matrix(), stabilizer, expected=analysis.vertex_count,
+                                  monitor=Monitor(progress, token, budget))
+        table = cosets.table if canonical is self else cosets.table[:, ::-1]
+        normals = self.mirror_normals()
+        return CompressedPolytope(self.coxeter_matrix(), self.nodes, normals,
+                                  _generate_start_point(normals, self.nodes), table)
+
+    def group_table(self, subgroup=()):
+        """Enumerates the cosets of a subgroup of the symmetry group directly from the
+        Coxeter presentation. With no subgroup this is the group's multiplication table
+        by the generating reflections."""
+        return enumerate_cosets(self.coxeter_matrix(), subgroup)
+
+    def find_reflection_sequences(self, normals, index=None, monitor=None):
+        """Finds a reflection sequence for each element of the symmetry group by reflecting
+        a generic point. The generic points are recorded in `index` in the same order as
+        the returned sequences."""
         start_point = _generate_start_point(normals, [1 for n in self.nodes])
+        if index is None:
+            index = VertexIndex(len(normals))
 
         # Begin with only an empty sequence which represents no reflections
         sequences = []
-        sequence_queue = [ReflectionSequence(normals, tuple(), start_point)]
+        sequence_queue = deque([ReflectionSequence(normals, tuple(), start_point)])
+        index.add(start_point)
 
         while sequence_queue:
-            seq = sequence_queue.pop(0)
+            seq = sequence_queue.popleft()
             sequences.append(seq)
+            if len(sequences) & 255 == 0:
+                report(monitor, 'group', len(index), len(sequence_queue),
+                       nbytes=len(index) * (8 * len(normals) + 200))
             for idx in range(len(normals)):
                 new_sequence = seq.add_reflection(idx)
-                if all(not new_sequence.is_close(s) for s in sequences) and all(not new_sequence.is_close(s) for s in sequence_queue):
+                _, is_new = index.add(new_sequence.point)
+                if is_new:
                     sequence_queue.append(new_sequence)
 
-
         return sequences
 
-    def polytope(self):
-        """Returns the vertices of the polytope defined by this diagram"""
-        print('generating polytope...')
+    def iter_polytope(self, progress=None, token=None, budget=None):
+        """Yields the polytope in (vertices, edges) chunks as its vertex orbit grows, so it
+        can be drawn or processed before generation finishes. See stream_polytope, and
+        polytope() for the other arguments."""
         normals = self.mirror_normals()
+        monitor = Monitor(progress, token, budget)
+        yield from stream_polytope(normals, _generate_start_point(normals, self.nodes), monitor)
+
+    def iter_tiling(self, radius=None, depth=None, progress=None, token=None, budget=None):
+        """Yields the part of the tiling of an affine or hyperbolic diagram within `radius`
+        of the start point, or within `depth` reflections of it, in (vertices, edges)
+        chunks. Affine tilings are drawn with unit edges and hyperbolic ones in the
+        Poincaré ball. See stream_tiling, and polytope() for the other arguments."""
+        space = TilingSpace(self._matrix, [float(bool(n)) for n in self._nodes])
+        monitor = Monitor(progress, token, budget)
+        yield from stream_tiling(space, [bool(n) for n in self._nodes], radius, depth, monitor)
+
+    def tiling(self, radius=None, depth=None, progress=None, token=None, budget=None):
+        """Returns the bounded part of a tiling from iter_tiling() as one Polytope, one
+        dimension lower than the diagram's rank"""
+        chunks = list(self.iter_tiling(radius, depth, progress, token, budget))
+        return Polytope(np.concatenate([vertices for vertices, _ in chunks]),
+                        np.concatenate([edges for _, edges in chunks]))
+
+    def polytope(self, backend='todd_coxeter', progress=None, token=None, budget=None, dtype=np.float64):
+        """Returns the polytope defined by this diagram, with its vertices in the precision
+        `dtype`. Its edges are an (E, 2) array of vertex indices and its faces are packed
+        index cycles.
+
+        Recently generated polytopes are kept in memory and shared between a diagram and
+        its mirror image, so the arrays of the result are read-only. Either way the result
+        is oriented to this diagram's mirrors.
+
+        By default the vertices are enumerated combinatorially with Todd–Coxeter coset
+        enumeration, as the cosets of the subgroup generated by the deactivated mirrors
+        (backend='todd_coxeter'), or geometrically by reflecting the start point one BFS
+        level of its orbit at a time (backend='orbit'). The orbit can also be enumerated in
+        exact arithmetic over the weight coordinates, which needs no tolerance to tell
+        vertices apart (backend='exact'). Either way the work grows with the number of
+        vertices. The remaining backends enumerate the whole symmetry group by
+        reflecting a generic point, one BFS level at a time (backend='frontier') or one
+        element at a time (backend='bfs').
+
+        While it runs, generation calls `progress` with a ProgressReport of how many
+        elements each stage has found and how large its frontier is. It raises
+        GenerationCancelled soon after `token` is cancelled and BudgetExceeded once it
+        outgrows `budget`. The time each stage takes is logged; profile() returns it."""
+        polytope = _cached_polytope(self.canonical(), backend, Monitor(progress, token, budget))
+        return self.orient(polytope).astype(dtype)
+
+    def profile(self, backend='todd_coxeter', trace_memory=False, progress=None, token=None, budget=None):
+        """Generates the polytope afresh, bypassing the cache, and returns it together with
+        the GenerationStats of each stage. With `trace_memory` the stats include the peak
+        memory of each stage, at some cost in speed."""
+        stats = GenerationStats(trace_memory)
+        polytope = self.canonical()._generate(backend, Monitor(progress, token, budget, stats))
+        return self.orient(polytope), stats
+
+    def _generate(self, backend, monitor=None):
+        if monitor is None:
+            monitor = Monitor()
+        if monitor.stats is None:
+            monitor.stats = GenerationStats()
+        stats = monitor.stats
+        logger.debug("generating %r with the %s backend", self, backend)
+
+        with stats.stage('analyse'):
+            analysis = self.analyse()
+        if not analysis.finite:
+            raise ValueError(f"the diagram's group is {analysis.geometry}, not finite")
+        with stats.stage('normals'):
+            normals = self.mirror_normals()
+        with stats.stage('start_point'):
+            start_point = _generate_start_point(normals, self.nodes)
+
+        with stats.stage('orbit'):
+            vertices, permutations = self._orbit(backend, normals, start_point, analysis, monitor)
+
+        with stats.stage('edges'):
+            # Reflect the edges between the start point and its images over and over
+            edges = orbit_edges(permutations, fundamental_edges(permutations), monitor)
+
+        with stats.stage('faces'):
+            faces = wythoff_faces(permutations, monitor)
+        polytope = Polytope(vertices, edges, faces,
+                            FaceLattice(permutations, self.coxeter_matrix(), [bool(n) for n in self.nodes]))
+
+        logger.info("generated %r: %d vertices, %d edges and %d faces in %.3fs", self,
+                    len(vertices), len(edges), polytope.face_count(), stats.seconds)
+        return polytope
+
+    def _orbit(self, backend, normals, start_point, analysis, monitor):
+        """Returns the vertices and the permutation of them induced by each mirror"""
+        if backend == 'orbit':
+            points, table = vertex_orbit(normals, start_point, monitor, analysis.vertex_count)
+        elif backend == 'exact':
+            field, exact_points, table = exact_orbit(self.coxeter_matrix(),
+                                                      [int(bool(n)) for n in self.nodes], monitor,
+                                                      analysis.vertex_count)
+            points = to_cartesian(field, exact_points, normals)
+        elif backend == 'todd_coxeter':
+            # The deactivated mirrors fix the start point, so its images are the cosets of
+            # the subgroup they generate
+            stabilizer = [idx for idx, n in enumerate(self.nodes) if not n]
+            cosets = enumerate_cosets(self.coxeter_matrix(), stabilizer, monitor=monitor,
+                                      expected=analysis.vertex_count)
+            points = _points_from_cosets(start_point, normals, cosets)
+            table = cosets.table
+        elif backend == 'frontier':
+            generic_point = _generate_start_point(normals, [1 for n in self.nodes])
+            points, table = frontier_orbit(normals, generic_point, start_point, monitor)
+        elif backend == 'bfs':
+            index = VertexIndex(len(normals))
+            sequences = self.find_reflection_sequences(normals, index, monitor)
+
+            points = np.empty((len(sequences), start_point.shape[0]))
+            for idx, sequence in enumerate(sequences):
+                points[idx] = sequence.reflect(start_point)
+
+            # Find where each mirror sends each group element
+            table = np.empty((len(sequences), len(normals)), np.int32)
+            for idx in range(len(normals)):
+                reflected_points = [s.add_reflection(idx).point for s in sequences]
+                table[:, idx] = index.find_many(reflected_points)
+            count(monitor, lookups=table.size)
+        else:
+            raise ValueError(f"unknown backend {backend!r}")
 
-        sequences = self.find_reflection_sequences(normals)
-
-        start_point = _generate_start_point(normals, self.nodes)
-        points = np.array([], np.float32).reshape(0, start_point.shape[0])
-
-        for sequence in sequences:
-            reflected_point = sequence.reflect(start_point).reshape(1, -1)
-            points = np.concatenate((points, reflected_point))
-
-        print('...done generating points')
+        if backend in ('orbit', 'exact', 'todd_coxeter'):
+            # The orbit is already made of distinct vertices
+            return points, table
+        vertices, permutations = vertex_permutations(points, table)
+        count(monitor, duplicates=len(points) - len(vertices))
+        return vertices, permutations
 
-        kdtree = KDTree([s.point for s in sequences])
-        # Begin with edges between the start point and its images
-        edges = []
-        edge_queue = []
-        for idx in range(len(normals)):
-            edge_queue.append((0, idx+1))
-        # Reflect the edges over and over
-        while edge_queue:
-            edge = edge_queue.pop(0)
-            edges.append(edge)
-            # Loop over each mirror normal
-            for idx in range(len(normals)):
-                # and construct a new edge by reflecting over that mirror
-                reflected_sequences = (sequences[edge[0]].add_reflection(idx), sequences[edge[1]].add_reflection(idx))
-                reflected_points = tuple(s.point for s in reflected_sequences)
-                idx1, idx2 = kdtree.query(reflected_points)[1]
-                if idx1 < idx2:
-                    new_edge = (idx1, idx2)
-                else:
-                    new_edge = (idx2, idx1)
-
-                if new_edge not in edges and new_edge not in edge_queue:
-                    edge_queue.append(new_edge)
-
-        print('...done generating edges')
-        print('done generating polytope')
-        return points, edges
 
 if __name__ == "__main__":
-    # Poor numerical stability of algorithms creates many close points
+    logging.basicConfig(level=logging.DEBUG)
     d = CoxeterDiagram([0, 0, 1], [5, 3])
-    print(d.polytope())
-    print(len(d.polytope()))
+    p = d.polytope(backend='exact')
+    print(p.vertices)
+    print(len(p.vertices), len(p.edges), p.face_count())
@@ -0,0 +1,132 @@
+import numpy as np
+
+from .progress import report, count
+
+# Each field Z[t] is given by t^2 = p + q t and the value of t. Its elements a + b t are
+# stored as integer pairs (a, b) in the last axis of an array.
+_FIELDS = {
+    2: (2, 0, np.sqrt(2)),
+    3: (3, 0, np.sqrt(3)),
+    5: (1, 1, (1 + np.sqrt(5)) / 2),
+}
+
+# -2 cos(pi / m) as an element of the field for each label m
+_LABELS = {
+    2: (None, (0, 0)),
+    3: (None, (-1, 0)),
+    4: (2, (0, -1)),
+    5: (5, (0, -1)),
+    6: (3, (0, -1)),
+}
+
+
+def exact_field(coxeter_matrix):
+    """Returns the field (p, q, t) that the reflections of a Coxeter group act over, together
+    with its symmetric Cartan matrix 2 n_i.n_j as an (n, n, 2) integer array. Raises a
+    ValueError when the labels need more than one square root, or one outside Z[sqrt 2],
+    Z[sqrt 3] and Z[phi]."""
+    matrix = np.asarray(coxeter_matrix, np.int64)
+    n = matrix.shape[0]
+    cartan = np.zeros((n, n, 2), np.int64)
+    fields = set()
+    for i in range(n):
+        cartan[i, i] = (2, 0)
+        for j in range(n):
+            if i == j:
+                continue
+            m = int(matrix[i, j])
+            if m not in _LABELS:
+                raise ValueError(f"no exact arithmetic for mirrors at an angle of pi/{m}")
+            field, value = _LABELS[m]
+            if field is not None:
+                fields.add(field)
+            cartan[i, j] = value
+
+    if len(fields) > 1:
+        raise ValueError("no exact arithmetic for groups mixing the labels 4, 5 and 6")
+    return _FIELDS[fields.pop() if fields else 2], cartan
+
+
+def multiply(field, x, y):
+    """Multiplies elements of the field, broadcasting over all but the last axis"""
+    p, q, _ = field
+    a, b = x[..., 0], x[..., 1]
+    c, d = y[..., 0], y[..., 1]
+    bd = b * d
+    return np.stack((a * c + p * bd, a * d + b * c + q * bd), axis=-1)
+
+
+def to_float(field, x):
+    return x[..., 0] + field[2] * x[..., 1]
+
+
+def _keys(points):
+    """Returns a hashable key per point from its exact coordinates"""
+    rows = np.ascontiguousarray(points.reshape(points.shape[0], -1))
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+
+
+def exact_orbit(coxeter_matrix, activation_values, monitor=None, size=None):
+    """Enumerates the orbit of a start point exactly, in fundamental weight coordinates.
+
+    A point's coordinates are its dot products with the mirror normals, which start out
+    as the (integer) activation values. Reflecting in mirror i subtracts x_i times row i
+    of the Cartan matrix, so every coordinate stays in the field and points are told
+    apart by hashing their coordinates rather than by any tolerance.
+
+    Returns the field, the (V, n, 2) exact coordinates with the start point first, and an
+    (V, n) int32 array whose column i is the permutation of the vertices induced by
+    mirror i. When the orbit's `size` is known its arrays are allocated up front. Progress
+    goes to the optional Monitor once per level."""
+    field, cartan = exact_field(coxeter_matrix)
+    n = cartan.shape[0]
+    start = np.zeros((1, n, 2), np.int64)
+    start[0, :, 0] = np.asarray(activation_values, np.int64)
+
+    index = {_keys(start)[0].tobytes(): 0}
+    points = np.empty((size or 16, n, 2), np.int64)
+    points[0] = start[0]
+    table = np.empty((size or 16, n), np.int32)
+    rows = 0
+    frontier = start
+
+    while frontier.shape[0]:
+        # (F, n mirrors, n coordinates, 2) images of the frontier
+        reflected = frontier[:, np.newaxis] - multiply(field, frontier[:, :, np.newaxis], cartan)
+        reflected = reflected.reshape(-1, n, 2)
+
+        keys, first, inverse = np.unique(_keys(reflected), return_index=True, return_inverse=True)
+        ids = np.empty(keys.shape[0], np.int64)
+        new = []
+        for k, key in enumerate(keys):
+            key = key.tobytes()
+            found = index.get(key)
+            if found is None:
+                found = index[key] = len(index)
+                new.append(k)
+            ids[k] = found
+
+        if len(index) > points.shape[0]:
+            grown = max(2 * points.shape[0], len(index))
+            points = np.concatenate((points, np.empty((grown - points.shape[0], n, 2), np.int64)))
+            table = np.concatenate((table, np.empty((grown - table.shape[0], n), np.int32)))
+        table[rows:rows + frontier.shape[0]] = ids[inverse.ravel()].reshape(-1, n)
+        rows += frontier.shape[0]
+
+        # New vertices are numbered in order of their keys, so gather them the same way
+        frontier = reflected[first[new]]
+        points[len(index) - frontier.shape[0]:len(index)] = frontier
+        report(monitor, 'vertices', len(index), frontier.shape[0], estimated_total=size,
+               nbytes=len(index) * (16 * n + 4 * n + 100))
+        count(monitor, frontier.shape[0], lookups=keys.shape[0],
+              duplicates=reflected.shape[0] - frontier.shape[0])
+
+    return field, points[:len(index)], table[:rows]
+
+
+def to_cartesian(field, points, normals):
+    """Converts exact weight coordinates to Cartesian points scaled so that the first has
+    unit length. The weights are the dual basis to the mirror normals."""
+    weights = np.linalg.inv(normals).T
+    cartesian = to_float(field, points) @ weights
+    return cartesian / np.linalg.norm(cartesian[0])
@@ -0,0 +1,223 @@
+import re
+import numpy as np
+
+from .wythoff import face_classes
+
+
+def linear_matrix(edges):
+    """Returns the Coxeter matrix of a linear diagram with the given edge labels"""
+    dimension = len(edges) + 1
+    matrix = np.full((dimension, dimension), 2, np.int64)
+    np.fill_diagonal(matrix, 1)
+    for idx, edge in enumerate(edges):
+        matrix[idx][idx + 1] = edge
+        matrix[idx + 1][idx] = edge
+    return matrix
+
+
+def coxeter_matrix(name):
+    """Returns the Coxeter matrix of a finite irreducible Coxeter group from its name: A_n,
+    B_n, D_n, E_6, E_7, E_8, F_4, H_3, H_4 or I_2(p), written as for example 'E8' or
+    'I2(7)'. Nodes follow Bourbaki's numbering, counting from 0."""
+    match = re.fullmatch(r'([A-IX])_?(\d+)(?:\((\d+)\))?', name.strip().upper())
+    if match is None:
+        raise ValueError(f"unknown Coxeter group {name!r}")
+    family, rank, label = match.group(1), int(match.group(2)), match.group(3)
+
+    if family == 'A' and rank >= 1:
+        return linear_matrix([3] * (rank - 1))
+    if family in 'BC' and rank >= 2:
+        return linear_matrix([3] * (rank - 2) + [4])
+    if family == 'D' and rank >= 4:
+        # Bourbaki: a chain 1 - ... - (n-2) with both n-1 and n attached to n-2
+        matrix = linear_matrix([3] * (rank - 2))
+        full = np.full((rank, rank), 2, np.int64)
+        np.fill_diagonal(full, 1)
+        full[:rank - 1, :rank - 1] = matrix
+        full[rank - 3][rank - 1] = full[rank - 1][rank - 3] = 3
+        return full
+    if family == 'E' and rank in (6, 7, 8):
+        # Bourbaki: a chain 1 - 3 - 4 - ... - n with 2 attached to 4
+        full = np.full((rank, rank), 2, np.int64)
+        np.fill_diagonal(full, 1)
+        chain = [0] + list(range(2, rank))
+        for i, j in zip(chain, chain[1:]):
+            full[i][j] = full[j][i] = 3
+        full[1][3] = full[3][1] = 3
+        return full
+    if family == 'F' and rank == 4:
+        return linear_matrix([3, 4, 3])
+    if family == 'H' and rank in (3, 4):
+        return linear_matrix([5] + [3] * (rank - 2))
+    if family == 'I' and rank == 2 and label is not None:
+        return linear_matrix([int(label)])
+    raise ValueError(f"unknown Coxeter group {name!r}")
+
+
+def _rings(text, rank):
+    """Reads which nodes are ringed from a string of 0s and 1s or of xs and os"""
+    if len(text) != rank or set(text.lower()) - set('01xo'):
+        raise ValueError(f"expected {rank} of 0/1 or x/o for the ringed nodes, not {text!r}")
+    return [c in '1xX' for c in text]
+
+
+def parse_diagram(text):
+    """Reads a diagram from a string, returning its Coxeter matrix and the ringed nodes.
+
+    Accepts Schläfli symbols of regular polytopes such as '{5,3,3}', optionally with the
+    ringed nodes as in 't0,3{4,3,3}'; linear Dynkin strings such as 'x4o3o3x', where x
+    marks a ringed node and the numbers are edge labels; and group names as understood
+    by coxeter_matrix, optionally followed by the rings as in 'E6:100001' or 'D4:xoox'.
+    A group name on its own gives None for the rings."""
+    text = text.strip()
+    schlafli = re.fullmatch(r'(?:t([\d,]+))?\{([\d,\s]+)\}', text)
+    if schlafli is not None:
+        matrix = linear_matrix([int(label) for label in schlafli.group(2).split(',')])
+        ringed = [int(i) for i in (schlafli.group(1) or '0').split(',') if i]
+        if any(i >= len(matrix) for i in ringed):
+            raise ValueError(f"{text!r} rings a node beyond its {len(matrix)} nodes")
+        return matrix, [i in ringed for i in range(len(matrix))]
+
+    if re.fullmatch(r'[xo](\d+[xo])*', text):
+        parts = re.split(r'(\d+)', text)
+        return linear_matrix([int(label) for label in parts[1::2]]), [c == 'x' for c in parts[::2]]
+
+    name, _, rings = text.partition(':')
+    matrix = coxeter_matrix(name)
+    return matrix, _rings(rings, len(matrix)) if rings else None
+
+
+# Orders of the exceptional groups
+_ORDERS = {'E6': 51840, 'E7': 2903040, 'E8': 696729600, 'F4': 1152, 'H3': 120, 'H4': 14400}
+
+
+def components(coxeter_matrix):
+    """Splits the nodes of a diagram into its connected components, whose groups commute"""
+    matrix = np.asarray(coxeter_matrix)
+    unvisited = set(range(matrix.shape[0]))
+    result = []
+    while unvisited:
+        component = [min(unvisited)]
+        unvisited.remove(component[0])
+        for i in component:
+            linked = sorted(j for j in unvisited if matrix[i][j] != 2)
+            unvisited.difference_update(linked)
+            component.extend(linked)
+        result.append(sorted(component))
+    return result
+
+
+def gram_matrix(coxeter_matrix):
+    """Returns the matrix of dot products between the unit normals of the mirrors, which
+    meet at an angle of pi / m. An entry of 0 in the Coxeter matrix stands for mirrors
+    that never meet, whose normals are given a dot product of -1."""
+    matrix = np.asarray(coxeter_matrix, float)
+    with np.errstate(divide='ignore'):
+        gram = -np.cos(np.pi / matrix)
+    gram[matrix == 0] = -1
+    return gram
+
+
+def geometry(coxeter_matrix):
+    """Returns 'spherical' when the group is finite (its Gram matrix is positive definite),
+    'affine' when the Gram matrix is only positive semidefinite, 'hyperbolic' when it has
+    exactly one negative eigenvalue and 'indefinite' otherwise"""
+    eigenvalues = np.linalg.eigvalsh(gram_matrix(coxeter_matrix))
+    tolerance = 1e-9
+    negative = np.count_nonzero(eigenvalues < -tolerance)
+    if negative == 0:
+        return 'spherical' if eigenvalues.min() > tolerance else 'affine'
+    return 'hyperbolic' if negative == 1 else 'indefinite'
+
+
+def _irreducible_type(matrix):
+    """Names a connected diagram whose group is known to be finite"""
+    rank = matrix.shape[0]
+    if rank == 1:
+        return 'A1'
+    labels = sorted(int(m) for m in matrix[np.triu_indices(rank, 1)] if m != 2)
+    if rank == 2:
+        return {3: 'A2', 4: 'B2'}.get(labels[0], f'I2({labels[0]})')
+
+    degrees = np.count_nonzero(matrix != 2, axis=1) - 1
+    if degrees.max() == 3:
+        # The arms hanging off the branch node tell D_n and E_n apart
+        branch = int(np.argmax(degrees))
+        arms = []
+        for start in np.flatnonzero(matrix[branch] == 3):
+            length, previous, node = 1, branch, start
+            while degrees[node] == 2:
+                previous, node = node, next(j for j in np.flatnonzero(matrix[node] == 3)
+                                            if j not in (previous, node))
+                length += 1
+            arms.append(length)
+        return f'D{rank}' if sorted(arms)[:2] == [1, 1] else f'E{rank}'
+
+    if labels.count(5):
+        return f'H{rank}'
+    if labels.count(4):
+        # F4 has its 4 in the middle of the chain, B_n at an end
+        ends = np.flatnonzero(degrees == 1)
+        return 'B%d' % rank if any(4 in matrix[e] for e in ends) else 'F4'
+    return f'A{rank}'
+
+
+def _irreducible_order(name):
+    if name in _ORDERS:
+        return _ORDERS[name]
+    family, rank = name[0], int(name[1:].split('(')[0])
+    if family == 'A':
+        return int(np.prod(np.arange(2, rank + 2, dtype=object)))
+    if family == 'B':
+        return 2 ** rank * int(np.prod(np.arange(2, rank + 1, dtype=object)))
+    if family == 'D':
+        return 2 ** (rank - 1) * int(np.prod(np.arange(2, rank + 1, dtype=object)))
+    # I2(m), the symmetries of an m-gon
+    return 2 * int(name[3:-1])
+
+
+def classify(coxeter_matrix):
+    """Names the irreducible factors of a finite Coxeter group, one for each connected
+    component of its diagram, as a list of (name, nodes) pairs. Raises a ValueError if the
+    group is infinite."""
+    matrix = np.asarray(coxeter_matrix, np.int64)
+    if geometry(matrix) != 'spherical':
+        raise ValueError("the Coxeter group is not finite")
+    return [(_irreducible_type(matrix[np.ix_(c, c)]), c) for c in components(matrix)]
+
+
+def group_order(coxeter_matrix):
+    """Returns the order of a finite Coxeter group from its irreducible factors"""
+    order = 1
+    for name, _ in classify(coxeter_matrix):
+        order *= _irreducible_order(name)
+    return order
+
+
+def orbit_size(coxeter_matrix, ringed):
+    """Returns the number of vertices of a Wythoffian polytope: the index of the subgroup
+    generated by the mirrors of the unringed nodes, which fixes the start point"""
+    matrix = np.asarray(coxeter_matrix, np.int64)
+    fixed = [i for i, r in enumerate(ringed) if not r]
+    stabilizer = group_order(matrix[np.ix_(fixed, fixed)]) if fixed else 1
+    return group_order(matrix) // stabilizer
+
+
+def face_counts(coxeter_matrix, ringed):
+    """Returns the number of faces of each rank from 0 to n - 1 of a Wythoffian polytope.
+
+    The faces generated by a set K of mirrors are stabilized by the parabolic subgroup of
+    K together with the unringed mirrors that commute with all of K, so each class of
+    faces has the index of that subgroup as its size."""
+    matrix = np.asarray(coxeter_matrix, np.int64)
+    order = group_order(matrix)
+    counts = []
+    for rank in range(len(ringed)):
+        count = 0
+        for mirrors in face_classes(matrix, ringed, rank):
+            fixed = [j for j in range(len(ringed)) if not ringed[j] and j not in mirrors
+                     and all(matrix[i][j] == 2 for i in mirrors)]
+            stabilizer = list(mirrors) + fixed
+            count += order // (group_order(matrix[np.ix_(stabilizer, stabilizer)]) if stabilizer else 1)
+        counts.append(count)
+    return counts
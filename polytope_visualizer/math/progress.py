@@ -0,0 +1,88 @@
+import threading
+from typing import NamedTuple, Optional
+
+
+class GenerationAborted(Exception):
+    """Raised when polytope generation stops before it finishes"""
+
+
+class GenerationCancelled(GenerationAborted):
+    """Raised when generation is cancelled through a CancellationToken"""
+
+
+class BudgetExceeded(GenerationAborted):
+    """Raised when generation grows past its Budget"""
+
+
+class CancellationToken:
+    """A flag that asks a running generation to stop. It may be set from any thread."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class Budget:
+    """Limits on how many elements a generation may enumerate and roughly how many bytes
+    its working arrays may take. None means unlimited."""
+    def __init__(self, max_elements: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_elements = max_elements
+        self.max_bytes = max_bytes
+
+    def check(self, found=None, nbytes=None):
+        if self.max_elements is not None and found is not None and found > self.max_elements:
+            raise BudgetExceeded(f"enumerated {found} elements, over the budget of {self.max_elements}")
+        if self.max_bytes is not None and nbytes is not None and nbytes > self.max_bytes:
+            raise BudgetExceeded(f"needed about {nbytes} bytes, over the budget of {self.max_bytes}")
+
+
+class ProgressReport(NamedTuple):
+    stage: str
+    found: int
+    frontier: int
+    estimated_total: Optional[int]
+
+
+class Monitor:
+    """Carries the progress callback, cancellation token, budget and GenerationStats of a
+    generation through the helpers doing the work. Each helper calls report() and count()
+    as it goes."""
+    def __init__(self, callback=None, token: CancellationToken = None, budget: Budget = None,
+                 stats=None):
+        self.callback = callback
+        self.token = token
+        self.budget = budget
+        self.stats = stats
+
+    def report(self, stage, found, frontier, estimated_total=None, nbytes=None, elements=True):
+        """Checks for cancellation and the budget, then passes the counts on to the callback.
+        Counts of things other than enumerated elements (such as edges) pass
+        elements=False so only their bytes are budgeted."""
+        if self.token is not None and self.token.cancelled:
+            raise GenerationCancelled("generation was cancelled")
+        if self.budget is not None:
+            self.budget.check(found if elements else None, nbytes)
+        if self.callback is not None:
+            self.callback(ProgressReport(stage, found, frontier, estimated_total))
+
+    def count(self, frontier=None, **counters):
+        """Adds to the counters of the stats' running stage, if there are stats"""
+        if self.stats is not None:
+            self.stats.count(frontier, **counters)
+
+
+def report(monitor, *args, **kwargs):
+    """Reports to a monitor that may be None"""
+    if monitor is not None:
+        monitor.report(*args, **kwargs)
+
+
+def count(monitor, frontier=None, **counters):
+    """Counts through a monitor that may be None"""
+    if monitor is not None:
+        monitor.count(frontier, **counters)
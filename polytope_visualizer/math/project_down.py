@@ -12,6 +12,19 @@ def project(p, screen_dist, eye_dist):
     return p, height_ratio
 
 
+def project_points(points, screen_dist, eye_dist):
+    """Projects an (N, n) array of points down to the plane in perspective, one dimension
+    at a time as project() does. Returns the (N, 2) points and the height ratio of the
+    last step for each."""
+    points = np.asarray(points, float)
+    height_ratio = np.ones(points.shape[0])
+    for iteration in range(points.shape[1] - 2):
+        height_ratio = (eye_dist - screen_dist) / (eye_dist - points[:, -1])
+        points = height_ratio[:, np.newaxis] * points[:, :-1]
+
+    return points, height_ratio
+
+
 def project_3d(points):
     """Projects the points orthographically to 3d"""
     dimension = points.shape[1]
@@ -21,6 +34,3 @@ def project_3d(points):
         zeros = np.zeros((points.shape[0], dimension + 1))
         zeros[:, :-1] = points
         return zeros
-
-
-v_project = np.vectorize(project, signature='(i),(),()->(n),()')
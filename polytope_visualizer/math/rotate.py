@@ -2,20 +2,27 @@ import numpy as np
 import math
 
 
-def rotate(point, angle, axis1, axis2):
-    """Rotates the point with the plane defined by the two axes"""
-    dimension = len(point)
+def rotation_matrix(dimension, angle, axis1, axis2):
+    """Returns the matrix rotating row vectors in the plane defined by the two axes"""
     matrix = np.identity(dimension)
 
     matrix[axis1][axis1] = math.cos(angle)
     matrix[axis1][axis2] = math.sin(angle)
     matrix[axis2][axis1] = -math.sin(angle)
     matrix[axis2][axis2] = math.cos(angle)
+    return matrix
+
 
-    return np.matmul(point, matrix)
+def rotate(point, angle, axis1, axis2):
+    """Rotates the point with the plane defined by the two axes"""
+    return np.matmul(point, rotation_matrix(len(point), angle, axis1, axis2))
 
 
-v_rotate = np.vectorize(rotate, signature='(i),(),(),()->(n)')
+def rotate_points(points, angle, axis1, axis2):
+    """Rotates an (N, n) array of points with the plane defined by the two axes"""
+    points = np.asarray(points)
+    matrix = rotation_matrix(points.shape[1], angle, axis1, axis2)
+    return np.matmul(points, matrix.astype(np.result_type(points.dtype, np.float32)))
 
 
 def reflect(vector, normal):
@@ -23,23 +30,64 @@ def reflect(vector, normal):
 
 
 class Rotor:
+    """A rotation by `angle` in the plane of two coordinate axes. Its axes and angle may be
+    changed in place."""
     def __init__(self, axis1, axis2, angle=0.0):
         self.axes = [axis1, axis2]
         self.angle = angle
 
+    def valid(self, dimension):
+        """Whether both axes exist in the given dimension"""
+        return all(0 <= axis < dimension for axis in self.axes)
+
+    def apply(self, matrix):
+        """Composes the rotation onto the right of a matrix acting on row vectors, in
+        place. Only the two columns of the rotation's plane change."""
+        i, j = self.axes
+        if i == j:
+            return matrix
+        c, s = math.cos(self.angle), math.sin(self.angle)
+        column_i, column_j = matrix[:, i].copy(), matrix[:, j].copy()
+        matrix[:, i] = c * column_i - s * column_j
+        matrix[:, j] = s * column_i + c * column_j
+        return matrix
+
+    def matrix(self, dimension):
+        return self.apply(np.eye(dimension))
+
     def rotate(self, points):
-        dimension = points.shape[1]
-        a = np.zeros((dimension,))
-        a[self.axes[0]] = 1
+        return np.matmul(points, self.matrix(points.shape[1]))
+
 
-        R = np.eye(dimension)
-        s, c = np.sin(self.angle/2), np.cos(self.angle/2)
-        R[self.axes[0], self.axes[0]] = c
-        R[self.axes[0], self.axes[1]] = -s
-        R[self.axes[1], self.axes[0]] = s
-        R[self.axes[1], self.axes[1]] = c
+class RotorChain:
+    """Applies a list of rotors in turn as a single matrix.
 
-        b = R.dot(a)
+    The rotors are composed into one n x n matrix, which is rebuilt only when one of their
+    axes or angles has changed since the last frame, so rotating is a single matmul into
+    a buffer that is reused while the points keep their shape. Rotors with axes beyond
+    the points' dimension are left out."""
+    def __init__(self, rotors=()):
+        self.rotors = list(rotors)
+        self._state = None
+        self._matrix = None
+        self._out = None
 
-        return reflect(reflect(points, a), b)
+    def set_rotors(self, rotors):
+        self.rotors = list(rotors)
 
+    def matrix(self, dimension, dtype=np.float64):
+        state = (dimension, np.dtype(dtype), tuple((tuple(r.axes), r.angle) for r in self.rotors))
+        if state != self._state:
+            matrix = np.eye(dimension)
+            for rotor in self.rotors:
+                if rotor.valid(dimension):
+                    rotor.apply(matrix)
+            self._matrix = matrix.astype(dtype)
+            self._state = state
+        return self._matrix
+
+    def rotate(self, points):
+        """Returns the rotated points. The result is overwritten by the next call."""
+        if self._out is None or self._out.shape != points.shape or self._out.dtype != points.dtype:
+            self._out = np.empty_like(points)
+        return np.matmul(points, self.matrix(points.shape[1], points.dtype), out=self._out)
@@ -0,0 +1,104 @@
+import logging
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StageStats:
+    """The time taken by one stage of a generation and what it counted along the way"""
+    def __init__(self):
+        self.seconds = 0.0
+        # Peak traced memory, when memory is traced
+        self.peak_bytes = None
+        self.counters = {}
+        self.frontier_sizes = []
+
+    @property
+    def levels(self):
+        return len(self.frontier_sizes)
+
+    def as_dict(self):
+        return {
+            'seconds': self.seconds,
+            'peak_bytes': self.peak_bytes,
+            'levels': self.levels,
+            'max_frontier': max(self.frontier_sizes, default=0),
+            'frontier_sizes': list(self.frontier_sizes),
+            **self.counters,
+        }
+
+
+class GenerationStats:
+    """Timings and counters for each stage of a generation.
+
+    Stages are timed with the stage() context manager, and the helpers doing the work add
+    counters and BFS levels to the running stage through the Monitor carrying the stats;
+    counts made outside any stage are dropped. With `trace_memory`
+    each stage also records its peak memory through tracemalloc, which slows it down
+    noticeably. Finished stages are logged at DEBUG level."""
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = OrderedDict()
+        self._current = None
+
+    def __getitem__(self, name):
+        if name not in self.stages:
+            self.stages[name] = StageStats()
+        return self.stages[name]
+
+    @property
+    def seconds(self):
+        return sum(stage.seconds for stage in self.stages.values())
+
+    @contextmanager
+    def stage(self, name):
+        stage = self[name]
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        outer, self._current = self._current, stage
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            self._current = outer
+            stage.seconds += time.perf_counter() - start
+            if self.trace_memory:
+                stage.peak_bytes = tracemalloc.get_traced_memory()[1]
+            if tracing:
+                tracemalloc.stop()
+            logger.debug("%s took %.4fs: %s", name, stage.seconds, self._describe(stage))
+
+    @staticmethod
+    def _describe(stage):
+        parts = [f"{key}={value}" for key, value in stage.counters.items()]
+        if stage.levels:
+            parts.insert(0, f"levels={stage.levels} max_frontier={max(stage.frontier_sizes)}")
+        if stage.peak_bytes is not None:
+            parts.append(f"peak={stage.peak_bytes / 2**20:.1f}MiB")
+        return ' '.join(parts)
+
+    def count(self, frontier=None, **counters):
+        """Adds to the counters of the running stage. Passing the size of a new `frontier`
+        also records one BFS level."""
+        stage = self._current
+        if stage is None:
+            return
+        if frontier is not None:
+            stage.frontier_sizes.append(int(frontier))
+        for key, value in counters.items():
+            stage.counters[key] = stage.counters.get(key, 0) + int(value)
+
+    def as_dict(self):
+        return {name: stage.as_dict() for name, stage in self.stages.items()}
+
+    def __str__(self):
+        lines = [f"{name:>12} {stage.seconds:9.4f}s  {self._describe(stage)}"
+                 for name, stage in self.stages.items()]
+        lines.append(f"{'total':>12} {self.seconds:9.4f}s")
+        return '\n'.join(lines)
@@ -0,0 +1,161 @@
+import numpy as np
+
+from .groups import gram_matrix, geometry
+from .progress import report, count
+from .vertex_index import VertexIndex
+
+
+class TilingSpace:
+    """Where the mirrors of an infinite Coxeter group live.
+
+    Affine groups act on Euclidean space of one dimension fewer than the rank, with points
+    written in homogeneous coordinates (x, 1). Hyperbolic groups act on the hyperboloid
+    <x, x> = -1 of Minkowski space, whose form has signature (+, ..., +, -). Either way
+    each reflection is a matrix acting on row vectors, and `start_point` is the point at
+    the given (0 or positive) distances from the mirrors of the fundamental chamber."""
+    def __init__(self, coxeter_matrix, activation_values):
+        self.geometry = geometry(coxeter_matrix)
+        values = np.asarray(activation_values, float)
+        eigenvalues, eigenvectors = np.linalg.eigh(gram_matrix(coxeter_matrix))
+
+        if self.geometry == 'affine':
+            self._affine(values, eigenvalues, eigenvectors)
+        elif self.geometry == 'hyperbolic':
+            self._hyperbolic(values, eigenvalues, eigenvectors)
+        else:
+            raise ValueError(f"cannot tile with a group that is {self.geometry}")
+
+    def _affine(self, values, eigenvalues, eigenvectors):
+        # Unit normals in one dimension fewer, from the nonzero part of the Gram matrix
+        keep = eigenvalues > 1e-9
+        if np.count_nonzero(~keep) != 1:
+            raise ValueError("only irreducible affine groups can be tiled")
+        normals = eigenvectors[:, keep] * np.sqrt(eigenvalues[keep])
+        # The normals are dependent through the kernel, and offsetting the mirrors along it
+        # closes them up into a simplex
+        kernel = np.abs(eigenvectors[:, ~keep].ravel())
+        offsets = kernel / kernel.dot(kernel)
+
+        # Solve n_i . x + b_i = t a_i for x and the scale t, then scale the whole picture
+        # so the longest edge, of length 2 t a_i, has unit length
+        system = np.concatenate((normals, -values[:, np.newaxis]), axis=1)
+        offsets = offsets / (2 * np.linalg.solve(system, -offsets)[-1] * values.max())
+        self.start_point = np.append(np.linalg.solve(system, -offsets)[:-1], 1)
+
+        # Mirror i is {x : n_i . x + b_i = 0}; as a homogeneous matrix it sends (x, 1) to
+        # (x - 2 (n_i . x + b_i) n_i, 1)
+        dimension = normals.shape[1] + 1
+        planes = np.concatenate((normals, offsets[:, np.newaxis]), axis=1)
+        self.reflections = np.repeat(np.eye(dimension)[np.newaxis], len(normals), axis=0)
+        self.reflections[:, :, :-1] -= 2 * planes[:, :, np.newaxis] * normals[:, np.newaxis, :]
+
+    def _hyperbolic(self, values, eigenvalues, eigenvectors):
+        # Order the axes so the single timelike one comes last
+        order = np.argsort(-eigenvalues)
+        normals = eigenvectors[:, order] * np.sqrt(np.abs(eigenvalues[order]))
+        self.form = np.ones(len(values))
+        self.form[-1] = -1
+
+        # With <x, y> = x J y, reflecting in unit normal n sends x to x - 2 <x, n> n
+        dimension = len(values)
+        self.reflections = (np.eye(dimension)[np.newaxis]
+                            - 2 * (normals * self.form)[:, :, np.newaxis] * normals[:, np.newaxis, :])
+
+        # <x, n_i> = -a_i puts x on the chamber's side of every mirror
+        point = np.linalg.solve(normals * self.form, -values)
+        norm = self.inner(point, point)
+        if norm >= 0:
+            raise ValueError("the start point lies at or beyond infinity")
+        point = point / np.sqrt(-norm)
+        self.start_point = point if point[-1] > 0 else -point
+
+        # The boost taking the start point to the bottom of the hyperboloid, so it ends up
+        # at the centre of the Poincaré ball
+        y, t = -self.start_point[:-1], self.start_point[-1]
+        self._boost = np.empty((dimension, dimension))
+        self._boost[:-1, :-1] = np.eye(dimension - 1) + np.outer(y, y) / (1 + t)
+        self._boost[:-1, -1] = self._boost[-1, :-1] = y
+        self._boost[-1, -1] = t
+
+    def inner(self, x, y):
+        return np.sum(x * self.form * y, axis=-1)
+
+    def distance(self, points):
+        """Returns the distance of each point from the start point"""
+        if self.geometry == 'affine':
+            return np.linalg.norm(points[:, :-1] - self.start_point[:-1], axis=1)
+        return np.arccosh(np.maximum(-self.inner(points, self.start_point), 1))
+
+    def project(self, points):
+        """Returns Euclidean coordinates for points: the points themselves for affine
+        groups, and their place in the Poincaré ball for hyperbolic groups, with the start
+        point at the origin either way"""
+        if self.geometry == 'affine':
+            return points[:, :-1] - self.start_point[:-1]
+        points = np.matmul(points, self._boost)
+        return points[:, :-1] / (1 + points[:, -1:])
+
+
+def _start_neighbours(space, ringed):
+    """Returns every vertex joined to the start point by an edge. These are its reflections
+    in the ringed mirrors, moved around by the subgroup of the unringed mirrors, which
+    fixes the start point."""
+    reflections = space.reflections
+    fixed = reflections[[i for i, r in enumerate(ringed) if not r]]
+    frontier = np.matmul(space.start_point, reflections[[i for i, r in enumerate(ringed) if r]])
+    index = VertexIndex(frontier.shape[1])
+    index.add_many(frontier)
+    while frontier.shape[0] and fixed.shape[0]:
+        images = np.matmul(frontier[:, np.newaxis, np.newaxis], fixed).reshape(-1, frontier.shape[1])
+        _, is_new = index.add_many(images)
+        frontier = images[is_new]
+    return index.points.copy()
+
+
+def stream_tiling(space: TilingSpace, ringed, radius=None, depth=None, monitor=None):
+    """Generates the vertices and edges of a tiling near its start point, one BFS level at
+    a time, in the same (vertices, edges) chunks as stream_polytope.
+
+    Only vertices within `radius` of the start point, or reached by at most `depth`
+    reflections, are enumerated; at least one of the bounds must be given. Each vertex
+    carries the group element that reached it, so its edges are the images of the start
+    point's edges to its reflections in the ringed mirrors, and are looked up in the
+    vertex index as the vertex is found. Vertices are yielded through space.project."""
+    if radius is None and depth is None:
+        raise ValueError("a tiling needs a radius or depth bound")
+    reflections = space.reflections
+    dimension = space.start_point.shape[0]
+    start = space.start_point
+    neighbours = _start_neighbours(space, ringed)
+
+    index = VertexIndex(dimension)
+    index.add(start)
+    yield space.project(start.reshape(1, -1)), np.empty((0, 2), np.int32)
+
+    # Each frontier vertex is start @ elements[k]
+    elements = np.eye(dimension)[np.newaxis]
+    level = 0
+    while elements.shape[0] and (depth is None or level < depth):
+        level += 1
+        # Reflecting a vertex in a fixed mirror appends that reflection to its element
+        elements = np.matmul(elements[:, np.newaxis], reflections).reshape(-1, dimension, dimension)
+        points = np.matmul(start, elements)
+        if radius is not None:
+            inside = space.distance(points) <= radius + 1e-9
+            elements, points = elements[inside], points[inside]
+
+        first = len(index)
+        _, is_new = index.add_many(points)
+        elements, points = elements[is_new], points[is_new]
+
+        # Edges to vertices found already, each kept once from its later end
+        ids = np.arange(first, first + points.shape[0])
+        ends = index.find_many(np.matmul(neighbours, elements).reshape(-1, dimension))
+        pairs = np.stack((np.repeat(ids, len(neighbours)), ends), axis=1)
+        pairs = pairs[(ends >= 0) & (ends < pairs[:, 0])]
+
+        report(monitor, 'tiles', len(index), points.shape[0],
+               nbytes=len(index) * 8 * (dimension + dimension * dimension))
+        count(monitor, points.shape[0], lookups=is_new.shape[0] + ends.shape[0],
+              duplicates=is_new.shape[0] - points.shape[0])
+        yield space.project(points), pairs[:, ::-1].astype(np.int32)
@@ -0,0 +1,103 @@
+import itertools
+import numpy as np
+
+
+class VertexIndex:
+    """An incremental hash grid for deduplicating points.
+
+    Coordinates are snapped to a grid of cells `resolution` wide and points that land in
+    the same cell are taken to be the same point, so distinct points must lie further than
+    2 * `resolution` apart. A point within a small margin of a cell wall is also looked
+    up in the neighbouring cells, so rounding noise never splits one point in two."""
+    margin = 1e-3
+
+    def __init__(self, dimension, resolution=1e-5, capacity=16):
+        self.dimension = dimension
+        self.resolution = resolution
+        self._cells = {}
+        # Storage doubles whenever it fills up, unless the capacity was enough
+        self._points = np.empty((max(capacity, 1), dimension))
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def points(self):
+        """The indexed points in insertion order"""
+        return self._points[:self._count]
+
+    def _snap(self, points):
+        """Returns the cell of each point, and for each coordinate whether the point sits
+        near the lower (-1) or upper (+1) wall of its cell"""
+        scaled = points / self.resolution + 0.5
+        cells = np.floor(scaled)
+        frac = scaled - cells
+        walls = np.zeros(points.shape, np.int8)
+        walls[frac < self.margin] = -1
+        walls[frac > 1 - self.margin] = 1
+        return cells.astype(np.int64), walls
+
+    def _lookup(self, cell, walls):
+        idx = self._cells.get(cell.tobytes())
+        if idx is not None:
+            return idx
+        if not walls.any():
+            return -1
+
+        # Probe every neighbouring cell across the walls the point is close to
+        choices = [(0, w) if w else (0,) for w in walls]
+        for offset in itertools.product(*choices):
+            if any(offset):
+                idx = self._cells.get((cell + offset).tobytes())
+                if idx is not None:
+                    return idx
+        return -1
+
+    def _append(self, point, cell):
+        if self._count == self._points.shape[0]:
+            self._points = np.concatenate((self._points, np.empty_like(self._points)))
+        idx = self._count
+        self._points[idx] = point
+        self._cells[cell.tobytes()] = idx
+        self._count += 1
+        return idx
+
+    def find(self, point):
+        """Returns the index of a point, or -1 if it has not been added"""
+        cells, walls = self._snap(np.reshape(point, (1, self.dimension)))
+        return self._lookup(cells[0], walls[0])
+
+    def add(self, point):
+        """Adds a point if it is new. Returns its index and whether it was new."""
+        cells, walls = self._snap(np.reshape(point, (1, self.dimension)))
+        idx = self._lookup(cells[0], walls[0])
+        if idx >= 0:
+            return idx, False
+        return self._append(point, cells[0]), True
+
+    def find_many(self, points):
+        """Returns the index of each point, with -1 for points that have not been added"""
+        points = np.reshape(points, (-1, self.dimension))
+        cells, walls = self._snap(points)
+        return np.array([self._lookup(c, w) for c, w in zip(cells, walls)], np.int64)
+
+    def add_many(self, points):
+        """Adds each new point in order. Returns the index of every point and a mask of the
+        points that were new."""
+        points = np.reshape(points, (-1, self.dimension))
+        cells, walls = self._snap(points)
+
+        # Only the first point in each cell has to be looked up
+        _, first, inverse = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+        unique_indices = np.empty(first.shape[0], np.int64)
+        is_new = np.zeros(points.shape[0], bool)
+        for u in np.argsort(first):
+            row = first[u]
+            idx = self._lookup(cells[row], walls[row])
+            if idx < 0:
+                idx = self._append(points[row], cells[row])
+                is_new[row] = True
+            unique_indices[u] = idx
+
+        return unique_indices[inverse.reshape(-1)], is_new
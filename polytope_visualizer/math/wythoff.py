@@ -0,0 +1,273 @@
+import itertools
+import numpy as np
+from scipy import sparse
+
+from .progress import report, count
+from .vertex_index import VertexIndex
+
+
+def vertex_permutations(points, group_table):
+    """Merges coincident points into vertices and finds each mirror's action on them.
+
+    `points` holds the image of the start point under each group element and
+    `group_table[g, i]` is the element reached from element g through mirror i. Returns the
+    distinct vertices, with the start point first, and an (V, n) int32 array whose column i
+    is the permutation of the vertices induced by mirror i."""
+    index = VertexIndex(points.shape[1])
+    vertex_ids, _ = index.add_many(points)
+
+    permutations = np.empty((len(index), group_table.shape[1]), np.int32)
+    permutations[vertex_ids] = vertex_ids[group_table]
+    return index.points.copy(), permutations
+
+
+def fundamental_edges(permutations):
+    """Returns the edges between the start vertex and its reflection in each mirror that
+    moves it"""
+    images = permutations[0]
+    images = images[images != 0]
+    return np.stack((np.zeros_like(images), images), axis=1)
+
+
+def _sorted_unique(keys):
+    """Returns the distinct keys in order. Sorting is quicker here than np.unique, which
+    may fall back to hashing."""
+    keys = np.sort(keys)
+    if keys.shape[0] == 0:
+        return keys
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+def _merge(visited, keys):
+    """Adds sorted keys that are not yet visited to the sorted visited keys"""
+    merged = np.concatenate((visited, keys))
+    merged.sort(kind='mergesort')
+    return merged
+
+
+def _contains(visited, keys):
+    """Returns which keys are among the sorted visited keys"""
+    if visited.shape[0] == 0:
+        return np.zeros(keys.shape[0], bool)
+    positions = np.minimum(np.searchsorted(visited, keys), visited.shape[0] - 1)
+    return visited[positions] == keys
+
+
+def _pack(pairs, size):
+    pairs = np.sort(pairs, axis=1).astype(np.int64)
+    return pairs[:, 0] * size + pairs[:, 1]
+
+
+def orbit_edges(permutations, seeds, monitor=None):
+    """Returns the orbit of the seed edges under the mirrors as an (E, 2) int32 array.
+
+    Each BFS level maps the whole frontier through every permutation at once, and edges are
+    deduplicated on integer keys packed from their sorted endpoints. Progress goes to the
+    optional Monitor once per level."""
+    size = permutations.shape[0]
+    keys = _sorted_unique(_pack(np.reshape(seeds, (-1, 2)), size))
+    visited = keys
+    levels = [keys]
+
+    while keys.shape[0]:
+        frontier = np.stack((keys // size, keys % size), axis=1)
+        # (F, 2, n) images, regrouped into one edge per (edge, mirror) pair
+        images = permutations[frontier].transpose(0, 2, 1).reshape(-1, 2)
+        keys = _sorted_unique(_pack(images, size))
+        keys = keys[~_contains(visited, keys)]
+        visited = _merge(visited, keys)
+        levels.append(keys)
+        report(monitor, 'edges', visited.shape[0], keys.shape[0], nbytes=24 * visited.shape[0], elements=False)
+        count(monitor, keys.shape[0], lookups=images.shape[0], duplicates=images.shape[0] - keys.shape[0])
+
+    keys = np.concatenate(levels)
+    return np.stack((keys // size, keys % size), axis=1).astype(np.int32)
+
+
+def _walk(permutations, word):
+    vertex = 0
+    for mirror in word:
+        vertex = permutations[vertex, mirror]
+    return vertex
+
+
+def fundamental_polygon(permutations, mirror1, mirror2):
+    """Returns the orbit of the start vertex under the rank-2 subgroup generated by two
+    mirrors, as a cycle of vertex indices, or None if the orbit is not a polygon.
+
+    The k-th vertex is the image of the start vertex under the alternating word
+    s1 s2 s1 ... of length k, which walks around the polygon in order."""
+    cycle = [0]
+    word = ()
+    while True:
+        # Prepending to the word is appending on the left of the group element
+        word = ((mirror1, mirror2)[len(word) % 2],) + word
+        vertex = _walk(permutations, word)
+        if vertex == 0 and len(word) % 2 == 0:
+            break
+        if vertex != cycle[-1]:
+            cycle.append(vertex)
+
+    if cycle[-1] == cycle[0]:
+        cycle.pop()
+    if len(cycle) < 3:
+        return None
+    return np.array(cycle, np.int32)
+
+
+def _face_keys(faces, size):
+    """Returns a hashable key per face that ignores where its cycle starts. Faces with few
+    enough vertices are packed into int64 keys, which sort much faster than raw bytes."""
+    rows = np.ascontiguousarray(np.sort(faces, axis=1), np.int64)
+    if size ** rows.shape[1] < 2 ** 63:
+        keys = np.zeros(rows.shape[0], np.int64)
+        for column in rows.T:
+            keys = keys * size + column
+        return keys
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+
+
+def orbit_faces(permutations, seed, monitor=None):
+    """Returns the orbit of a face under the mirrors as an (F, k) array of index cycles"""
+    size = permutations.shape[0]
+    frontier = np.reshape(seed, (1, -1))
+    visited = _face_keys(frontier, size)
+    levels = [frontier]
+
+    while frontier.shape[0]:
+        # (F, k, n) images, regrouped into one face per (face, mirror) pair
+        images = permutations[frontier].transpose(0, 2, 1).reshape(-1, frontier.shape[1])
+        keys, first = np.unique(_face_keys(images, size), return_index=True)
+        new = ~_contains(visited, keys)
+        frontier = images[np.sort(first[new])]
+        visited = _merge(visited, keys[new])
+        levels.append(frontier)
+        report(monitor, 'faces', visited.shape[0], frontier.shape[0],
+               nbytes=8 * frontier.shape[1] * visited.shape[0], elements=False)
+        count(monitor, frontier.shape[0], lookups=images.shape[0],
+              duplicates=images.shape[0] - frontier.shape[0])
+
+    return np.concatenate(levels)
+
+
+def wythoff_faces(permutations, monitor=None):
+    """Returns the 2-faces of a Wythoffian polytope in packed form.
+
+    Every class of faces is the orbit of the fundamental polygon of a pair of mirrors. The
+    result is a pair (offsets, indices) where face f is the cycle
+    indices[offsets[f]:offsets[f + 1]]."""
+    faces = []
+    n = permutations.shape[1]
+    for i in range(n):
+        for j in range(i + 1, n):
+            polygon = fundamental_polygon(permutations, i, j)
+            if polygon is not None:
+                faces.append(orbit_faces(permutations, polygon, monitor))
+
+    sizes = [np.full(f.shape[0], f.shape[1], np.int64) for f in faces]
+    offsets = np.zeros(1 + sum(f.shape[0] for f in faces), np.int64)
+    if faces:
+        np.cumsum(np.concatenate(sizes), out=offsets[1:])
+        indices = np.concatenate([f.ravel() for f in faces]).astype(np.int32)
+    else:
+        indices = np.empty(0, np.int32)
+    return offsets, indices
+
+
+def face_classes(coxeter_matrix, ringed, rank):
+    """Returns the sets of mirrors whose parabolic subgroups generate the faces of a rank.
+
+    A set of mirrors generates a face exactly when each connected component of its part of
+    the diagram contains a ringed node."""
+    n = len(coxeter_matrix)
+    classes = []
+    for mirrors in itertools.combinations(range(n), rank):
+        unvisited = set(mirrors)
+        valid = True
+        while unvisited and valid:
+            component = [unvisited.pop()]
+            for i in component:
+                linked = [j for j in unvisited if coxeter_matrix[i][j] != 2]
+                unvisited.difference_update(linked)
+                component.extend(linked)
+            valid = any(ringed[i] for i in component)
+        if valid:
+            classes.append(mirrors)
+    return classes
+
+
+def subgroup_orbit(permutations, mirrors):
+    """Returns the sorted orbit of the start vertex under the subgroup generated by some
+    mirrors"""
+    orbit = np.zeros(1, np.int32)
+    frontier = orbit
+    while frontier.shape[0]:
+        images = np.unique(permutations[frontier][:, list(mirrors)])
+        frontier = np.setdiff1d(images, orbit, assume_unique=True)
+        orbit = np.union1d(orbit, frontier)
+    return orbit.astype(np.int32)
+
+
+class FaceLattice:
+    """The faces of every rank of a Wythoffian polytope and their incidences.
+
+    Each rank is only enumerated when it is first asked for. The faces of rank k are
+    stored as an (F_k, V) CSR matrix of vertex membership, and the incidences between
+    ranks k - 1 and k as an (F_(k-1), F_k) boolean CSR matrix."""
+    def __init__(self, permutations, coxeter_matrix, ringed):
+        self.permutations = permutations
+        self.coxeter_matrix = coxeter_matrix
+        self.ringed = ringed
+        self.rank = len(ringed)
+        self._faces = {}
+        self._incidences = {}
+
+    def _enumerate(self, rank):
+        vertex_count = self.permutations.shape[0]
+        if rank == 0:
+            return sparse.identity(vertex_count, bool, format='csr')
+        if rank == self.rank:
+            return sparse.csr_matrix(np.ones((1, vertex_count), bool))
+
+        faces = []
+        for mirrors in face_classes(self.coxeter_matrix, self.ringed, rank):
+            seed = subgroup_orbit(self.permutations, mirrors)
+            faces.append(np.sort(orbit_faces(self.permutations, seed), axis=1))
+
+        counts = [f.shape[0] for f in faces]
+        indptr = np.zeros(1 + sum(counts), np.int64)
+        if faces:
+            sizes = np.concatenate([np.full(f.shape[0], f.shape[1]) for f in faces])
+            np.cumsum(sizes, out=indptr[1:])
+            indices = np.concatenate([f.ravel() for f in faces])
+        else:
+            indices = np.empty(0, np.int32)
+        data = np.ones(indices.shape[0], bool)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, vertex_count))
+
+    def faces(self, rank):
+        """Returns the vertex membership matrix of the faces of a rank"""
+        if not 0 <= rank <= self.rank:
+            raise ValueError(f"rank must be between 0 and {self.rank}")
+        if rank not in self._faces:
+            self._faces[rank] = self._enumerate(rank)
+        return self._faces[rank]
+
+    def count(self, rank):
+        return self.faces(rank).shape[0]
+
+    def incidence(self, rank):
+        """Returns which faces of rank - 1 lie on which faces of rank"""
+        if not 1 <= rank <= self.rank:
+            raise ValueError(f"rank must be between 1 and {self.rank}")
+        if rank not in self._incidences:
+            lower = self.faces(rank - 1).astype(np.int32)
+            upper = self.faces(rank).astype(np.int32)
+            shared = (lower @ upper.T).tocsr()
+            # A lower face lies on an upper face when all of its vertices do
+            sizes = np.diff(lower.indptr)
+            rows = np.repeat(np.arange(shared.shape[0]), np.diff(shared.indptr))
+            shared.data = shared.data == sizes[rows]
+            shared.eliminate_zeros()
+            self._incidences[rank] = shared.astype(bool)
+        return self._incidences[rank]
@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from polytope_visualizer import batch
+
+
+def test_run(tmp_path):
+    diagrams = batch.expand(['{3,3}', 'B2', '{4,4}'])
+    assert [label for label, _ in diagrams] == ['{3,3}', 'B2:01', 'B2:10', 'B2:11', '{4,4}']
+
+    records = batch.run(diagrams, str(tmp_path), jobs=1, log=lambda line: None)
+    assert [r.get('vertices') for r in records] == [4, 4, 4, 8, None]
+    assert 'error' in records[-1]
+    assert set(records[0]['stages']) >= {'orbit', 'edges', 'faces'}
+    with np.load(tmp_path / records[3]['file']) as arrays:
+        assert arrays['vertices'].shape == (8, 2) and arrays['edges'].shape == (8, 2)
+
+
+def test_main(tmp_path):
+    assert batch.main(['x3o3o', 'I2(5):11', '--output', str(tmp_path), '--jobs', '2']) == 0
+    with open(tmp_path / 'results.json') as f:
+        results = json.load(f)['results']
+    assert [(r['label'], r['vertices']) for r in results] == [('x3o3o', 4), ('I2(5):11', 10)]
+
+
+def test_no_gui_imports():
+    code = ("import sys, polytope_visualizer.batch; "
+            "assert not [m for m in sys.modules if m.startswith(('PyQt5', 'OpenGL'))]")
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_max_vertices(tmp_path):
+    diagrams = batch.expand(['H4:1111', 'H4:0001', 'B4:1111'])
+    records = batch.run(diagrams, str(tmp_path), jobs=1, max_vertices=14400, log=lambda line: None)
+    assert [r['vertices'] for r in records] == [14400, 120, 384]
+    assert not any('skipped' in r for r in records)
+
+    records = batch.run(diagrams, str(tmp_path / 'small'), jobs=1, max_vertices=100,
+                        log=lambda line: None)
+    assert all('skipped' in r and 'file' not in r for r in records)
+    assert [r['vertices'] for r in records] == [14400, 120, 384]
@@ -0,0 +1,16 @@
+from benchmarks import polytopes
+
+
+def test_counts_match_formulas():
+    lines = []
+    results = polytopes.run(['A3', 'H3', 'D4'], log=lines.append)
+    assert len(results) == 7 + 7 + 15
+    assert all(not r['errors'] for r in results)
+    assert all(set(r['stages']) >= {'orbit', 'edges', 'faces', 'lattice_3'} for r in results if r['group'] == 'D4')
+
+
+def test_compare():
+    baseline = {'results': [{'group': 'B3', 'nodes': [1, 0, 0], 'seconds': 0.1}]}
+    results = [{'group': 'B3', 'nodes': [1, 0, 0], 'seconds': 0.5}]
+    assert polytopes.compare(results, baseline) == [(('B3', (1, 0, 0)), 0.1, 0.5)]
+    assert polytopes.compare(results, {'results': []}) == []
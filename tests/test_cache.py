@@ -0,0 +1,46 @@
+import numpy as np
+
+from polytope_visualizer.cache import PolytopeCache
+from polytope_visualizer.math import diagram
+
+
+def test_round_trip(tmp_path):
+    cache = PolytopeCache(str(tmp_path))
+    d = diagram.CoxeterDiagram([1, 1, 0], [4, 3])
+    assert cache.load(d) is None
+
+    polytope = cache.polytope(d)
+    cached = cache.load(d)
+    assert isinstance(cached.edges, np.memmap)
+    assert np.allclose(cached.vertices, polytope.vertices)
+    # A canonical diagram's vertices are mapped straight from the entry
+    assert isinstance(cache.load(d.canonical()).vertices, np.memmap)
+    assert np.array_equal(cached.edges, polytope.edges)
+    assert np.array_equal(cached.faces[1], polytope.faces[1])
+    assert cached.face_count() == polytope.face_count()
+    assert cached.lattice.count(2) == 14
+
+
+def test_key():
+    cache = PolytopeCache()
+    assert cache.key(diagram.CoxeterDiagram([1, 0, 0], [4, 3])) == \
+        cache.key(diagram.CoxeterDiagram([True, False, False], [4, 3]))
+    assert cache.key(diagram.CoxeterDiagram([1, 0, 0], [4, 3])) != \
+        cache.key(diagram.CoxeterDiagram([0, 0, 1], [4, 3]))
+
+
+def test_eviction(tmp_path):
+    cache = PolytopeCache(str(tmp_path), max_bytes=0)
+    d = diagram.CoxeterDiagram([1, 0, 0], [5, 3])
+    cache.polytope(d)
+    assert cache.entries() == []
+    assert cache.load(d) is None
+
+
+def test_mirror_image_shares_entry(tmp_path):
+    cache = PolytopeCache(str(tmp_path))
+    cache.polytope(diagram.CoxeterDiagram([1, 1, 0], [4, 3]))
+    mirrored = cache.load(diagram.CoxeterDiagram([0, 1, 1], [3, 4]))
+    assert mirrored is not None
+    assert len(cache.entries()) == 1
+    assert mirrored.lattice.count(2) == 14
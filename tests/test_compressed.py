@@ -0,0 +1,31 @@
+import pickle
+
+import numpy as np
+
+from polytope_visualizer.math import diagram
+
+
+def test_matches_polytope():
+    d = diagram.CoxeterDiagram([1, 1, 0, 1], [5, 3, 3])
+    polytope = d.polytope()
+    compressed = d.compressed_polytope()
+    assert compressed.vertices.shape == polytope.vertices.shape
+    assert np.allclose(compressed.vertices[100:110], polytope.vertices[100:110])
+    assert np.allclose(compressed.vertices[7], polytope.vertices[7])
+    assert np.array_equal(compressed.edges, polytope.edges)
+    assert compressed.face_count() == polytope.face_count()
+    assert compressed.lattice.count(3) == polytope.lattice.count(3)
+
+
+def test_compact():
+    # The omnitruncated 5-orthoplex
+    compressed = diagram.CoxeterDiagram([1, 1, 1, 1, 1], [4, 3, 3, 3]).compressed_polytope()
+    assert compressed.permutations.dtype == np.uint16
+    data = pickle.dumps(compressed)
+    assert len(data) < 50_000
+    # Nothing expanded is pickled, and everything expands again afterwards
+    compressed.edges
+    assert len(pickle.dumps(compressed)) == len(data)
+    restored = pickle.loads(data)
+    assert np.allclose(np.asarray(restored.vertices), np.asarray(compressed.vertices))
+    assert restored.edges.shape == (9600, 2)
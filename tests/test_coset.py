@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from polytope_visualizer.math import diagram
+from polytope_visualizer.math.coset import enumerate_cosets
+from polytope_visualizer.math.progress import Monitor
+
+
+@pytest.mark.parametrize("edges, order", [
+    ([3], 6),
+    ([5], 10),
+    ([4, 3], 48),
+    ([5, 3], 120),
+    ([3, 3, 3], 120),
+    ([5, 3, 3], 14400),
+])
+def test_group_order(edges, order):
+    d = diagram.CoxeterDiagram([1] * (len(edges) + 1), edges)
+    table = d.group_table().table
+    assert table.shape == (order, len(edges) + 1)
+    # Every generator acts as an involution
+    for idx in range(table.shape[1]):
+        assert np.all(table[table[:, idx], idx] == np.arange(order))
+
+
+def test_subgroup_index():
+    d = diagram.CoxeterDiagram([1, 0, 0, 0], [5, 3, 3])
+    cosets = d.group_table(subgroup=(1, 2, 3))
+    assert len(cosets) == 600
+    assert np.all(cosets.table[0, 1:] == 0)
+
+
+def test_infinite_group():
+    with pytest.raises(RuntimeError):
+        enumerate_cosets([[1, 6, 2], [6, 1, 3], [2, 3, 1]], max_cosets=1000)
+
+
+def test_stabilizer_cosets():
+    # The 120-cell's 600 vertices without enumerating all 14400 group elements
+    d = diagram.CoxeterDiagram([1, 0, 0, 0], [5, 3, 3])
+    reports = []
+    polytope = d._generate('todd_coxeter', Monitor(reports.append))
+    assert polytope.vertices.shape == (600, 4)
+    assert len(polytope.edges) == 1200
+    assert max(r.found for r in reports if r.stage == 'cosets') < 14400
+
+
+@pytest.mark.parametrize("backend", ['orbit', 'exact', 'frontier', 'bfs'])
+def test_geometric_backends_agree(backend):
+    d = diagram.CoxeterDiagram([1, 1, 0], [4, 3])
+    polytope = d.polytope(backend='todd_coxeter')
+    other = d.polytope(backend=backend)
+    points, other_points = polytope.vertices, other.vertices
+    assert points.shape == other_points.shape
+    assert len(polytope.edges) == len(other.edges)
+    assert polytope.face_count() == other.face_count()
+    assert np.allclose(np.sort(np.round(points, 6), axis=0), np.sort(np.round(other_points, 6), axis=0))
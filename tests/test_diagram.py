@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from polytope_visualizer.math import diagram
@@ -6,3 +7,144 @@ def test_gen_53():
     d = diagram.CoxeterDiagram([1, 1, 1], [5, 3])
     print(d.polytope())
 
+
+
+def test_mirror_image_is_equal():
+    d = diagram.CoxeterDiagram([1, 0, 0], [4, 3])
+    mirrored = diagram.CoxeterDiagram([0, 0, 1], [3, 4])
+    assert d == mirrored
+    assert hash(d) == hash(mirrored)
+    assert d != diagram.CoxeterDiagram([0, 0, 1], [4, 3])
+    assert len({d, mirrored}) == 1
+
+
+def test_immutable():
+    d = diagram.CoxeterDiagram([True, False, False], [4, 3])
+    with pytest.raises(AttributeError):
+        d.nodes = (False, False, True)
+
+
+def test_polytope_memoized():
+    d = diagram.CoxeterDiagram([1, 1, 0], [5, 3])
+    polytope = d.polytope()
+    # The mirror image shares the generated arrays, turned to its own orientation
+    mirror = diagram.CoxeterDiagram([0, 1, 1], [3, 5])
+    assert mirror.polytope() is mirror.polytope()
+    assert mirror.polytope().edges is polytope.edges
+    assert not polytope.vertices.flags.writeable
+    assert d.mirror_normals() is d.mirror_normals()
+
+
+def test_group_matrices():
+    d = diagram.CoxeterDiagram([1, 0, 0], [5, 3])
+    matrices, table = d.group_matrices()
+    assert matrices.shape == (120, 3, 3)
+    assert np.allclose(np.matmul(matrices, matrices.transpose(0, 2, 1)), np.eye(3))
+    assert d.group_matrices()[0] is matrices
+
+
+def test_seeded_polytope():
+    d = diagram.CoxeterDiagram([1, 0, 0], [4, 3])
+    cube = d.seeded_polytope([1, 0, 0])
+    assert cube.vertices.shape == (8, 3)
+    assert cube.edges.shape == (12, 2)
+    # Partway to a full truncation every corner is cut off
+    truncated = d.seeded_polytope([1, 0.5, 0])
+    assert truncated.vertices.shape == (24, 3)
+    assert truncated.edges.shape == (36, 2)
+    # A vanishingly small value merges back to the cube
+    assert d.seeded_polytope([1, 1e-9, 0]).vertices.shape == (8, 3)
+    # Previews skip the faces
+    preview = d.seeded_polytope([1, 0.5, 0], faces=False)
+    assert preview.edges.shape == (36, 2) and preview.face_count() == 0 and preview.lattice is None
+
+
+def _sorted_rows(points):
+    return points[np.lexsort(np.round(points, 9).T)]
+
+
+def test_iter_polytope():
+    d = diagram.CoxeterDiagram([1, 1, 0, 1], [5, 3, 3])
+    polytope = d.polytope()
+    chunks = list(d.iter_polytope())
+    vertices = np.concatenate([v for v, _ in chunks])
+    edges = np.concatenate([e for _, e in chunks])
+    assert vertices.shape == polytope.vertices.shape
+    assert edges.shape == polytope.edges.shape
+    # The diagram is not canonical, yet both are oriented to its own mirrors
+    assert d.canonical() is not d
+    assert np.allclose(_sorted_rows(vertices), _sorted_rows(polytope.vertices))
+    assert len(set(map(tuple, np.sort(edges, axis=1).tolist()))) == len(edges)
+    # Edges only refer to vertices that have already been yielded
+    seen = 0
+    for v, e in chunks:
+        seen += len(v)
+        assert e.size == 0 or e.max() < seen
+
+
+def test_uniform_edges():
+    d = diagram.CoxeterDiagram([1, 1, 0, 1], [5, 3, 3])
+    p = d.polytope()
+    lengths = np.linalg.norm(p.vertices[p.edges[:, 0]] - p.vertices[p.edges[:, 1]], axis=1)
+    assert np.allclose(lengths, lengths[0])
+
+
+@pytest.mark.parametrize("name, nodes, vertices, edges", [
+    ('D4', [1, 0, 0, 0], 8, 24),
+    ('D5', [1, 0, 0, 0, 0], 10, 40),
+    ('E6', [1, 0, 0, 0, 0, 0], 27, 216),
+    ('E7', [0, 0, 0, 0, 0, 0, 1], 56, 756),
+    ('E8', [0, 0, 0, 0, 0, 0, 0, 1], 240, 6720),
+])
+def test_branched_diagrams(name, nodes, vertices, edges):
+    d = diagram.CoxeterDiagram.from_group(name, nodes)
+    assert not d.is_linear()
+    p = d.polytope()
+    assert p.vertices.shape == (vertices, len(nodes))
+    assert p.edges.shape == (edges, 2)
+
+
+def test_from_matrix():
+    linear = diagram.CoxeterDiagram([1, 0, 0], [4, 3])
+    assert diagram.CoxeterDiagram.from_matrix([1, 0, 0], linear.coxeter_matrix()) == linear
+    assert diagram.CoxeterDiagram.from_group('B3', [0, 0, 1]) == linear
+    with pytest.raises(ValueError):
+        diagram.CoxeterDiagram.from_matrix([1, 0], [[1, 3], [4, 1]])
+    # The affine group of the triangular tiling has no Euclidean mirrors around a point
+    with pytest.raises(ValueError):
+        diagram.CoxeterDiagram.from_matrix([1, 0, 0], [[1, 3, 3], [3, 1, 3], [3, 3, 1]]).mirror_normals()
+
+
+def test_polytope_precision():
+    d = diagram.CoxeterDiagram([1, 0, 0, 0], [5, 3, 3])
+    polytope = d.polytope()
+    single = d.polytope(dtype=np.float32)
+    assert polytope.vertices.dtype == np.float64
+    assert single.vertices.dtype == np.float32
+    assert single.vertices.flags.c_contiguous
+    assert single.edges is polytope.edges
+    assert polytope.edges.dtype == np.int32 and polytope.edges.shape == (1200, 2)
+    assert single.nbytes < polytope.nbytes
+    assert single.segments().shape == (1200, 2, 4)
+
+
+def test_vertex_orbit_without_size():
+    # Levels of the omnitruncated B6 outgrow the table more than twice over
+    d = diagram.CoxeterDiagram.from_group('B6', [1] * 6)
+    normals = d.mirror_normals()
+    points, table = diagram.vertex_orbit(normals, diagram._generate_start_point(normals, d.nodes))
+    assert points.shape == (46080, 6) and table.shape == (46080, 6)
+    assert np.array_equal(np.sort(table[:, 0]), np.arange(46080))
+
+
+def test_mirror_image_orientation():
+    d = diagram.CoxeterDiagram([1, 1, 0], [4, 3])
+    assert d.canonical() is not d
+    p = d.polytope()
+    seeded = d.seeded_polytope([1, 1, 0])
+    assert np.allclose(_sorted_rows(p.vertices), _sorted_rows(seeded.vertices))
+    # The start point comes first and the faces of each rank are counted for this diagram
+    assert np.allclose(p.vertices[0], diagram._generate_start_point(d.mirror_normals(), d.nodes))
+    assert [p.lattice.faces(rank).shape[0] for rank in range(3)] == \
+        [seeded.lattice.faces(rank).shape[0] for rank in range(3)]
+    assert np.allclose(d.compressed_polytope().vertices[:], p.vertices)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from polytope_visualizer.math import diagram
+from polytope_visualizer.math.exact import exact_field, exact_orbit, multiply, to_float
+from polytope_visualizer.math.groups import coxeter_matrix
+
+
+def test_golden_field():
+    field, cartan = exact_field(coxeter_matrix('H3'))
+    phi = np.array([0, 1])
+    # phi^2 = phi + 1
+    assert np.all(multiply(field, phi, phi) == [1, 1])
+    assert np.isclose(to_float(field, cartan[0, 1]), -2 * np.cos(np.pi / 5))
+
+
+def test_mixed_fields():
+    # B2 x H2 is finite but needs both sqrt 2 and sqrt 5
+    matrix = [[1, 4, 2, 2], [4, 1, 2, 2], [2, 2, 1, 5], [2, 2, 5, 1]]
+    with pytest.raises(ValueError):
+        exact_field(matrix)
+
+
+@pytest.mark.parametrize("name, nodes, vertices", [
+    ('H4', [0, 0, 0, 1], 120),
+    ('H4', [1, 1, 1, 1], 14400),
+    ('E6', [1, 0, 0, 0, 0, 1], 270),
+])
+def test_exact_orbit(name, nodes, vertices):
+    field, points, table = exact_orbit(coxeter_matrix(name), nodes)
+    assert points.shape == (vertices, len(nodes), 2)
+    assert len({p.tobytes() for p in points}) == vertices
+    for idx in range(table.shape[1]):
+        assert np.all(table[table[:, idx], idx] == np.arange(vertices))
+
+
+def test_exact_backend_uniform():
+    d = diagram.CoxeterDiagram([1, 0, 1, 1], [5, 3, 3])
+    p = d.polytope(backend='exact')
+    lengths = np.linalg.norm(p.vertices[p.edges[:, 0]] - p.vertices[p.edges[:, 1]], axis=1)
+    assert np.allclose(lengths, lengths[0])
+    assert np.isclose(np.linalg.norm(p.vertices[0]), 1)
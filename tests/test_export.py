@@ -0,0 +1,74 @@
+import json
+import struct
+
+import numpy as np
+
+from polytope_visualizer import export
+from polytope_visualizer.math import diagram
+
+
+def _polytope():
+    # Squares and hexagons in four dimensions
+    return diagram.CoxeterDiagram([1, 1, 0, 1], [4, 3, 3]).polytope()
+
+
+def test_ply(tmp_path):
+    p = _polytope()
+    path = tmp_path / 'p.ply'
+    export.export(str(path), p)
+    data = path.read_bytes()
+    header, body = data.split(b'end_header\n')
+    assert b'binary_little_endian' in header and b'property double c3' in header
+
+    vertices = np.frombuffer(body, np.dtype([('position', '<f4', 3), ('coordinates', '<f8', 4)]),
+                             len(p.vertices))
+    assert np.allclose(vertices['coordinates'], p.vertices)
+    assert np.allclose(vertices['position'], p.vertices[:, :3])
+    edges = np.frombuffer(body[len(body) - 8 * len(p.edges):], '<i4').reshape(-1, 2)
+    assert np.array_equal(edges, p.edges)
+
+
+def test_off(tmp_path):
+    p = _polytope()
+    path = tmp_path / 'p.off'
+    export.write_off(str(path), p)
+    lines = path.read_text().splitlines()
+    assert lines[:3] == ['nOFF', '4', f'{len(p.vertices)} {p.face_count()} {len(p.edges)}']
+    vertices = np.array([line.split() for line in lines[3:3 + len(p.vertices)]], float)
+    assert np.array_equal(vertices, p.vertices)
+    faces = lines[3 + len(p.vertices):]
+    assert len(faces) == p.face_count()
+    assert [int(i) for i in faces[-1].split()[1:]] == list(p.face(p.face_count() - 1))
+
+
+def test_glb(tmp_path):
+    p = _polytope()
+    path = tmp_path / 'p.glb'
+    export.write_glb(str(path), p)
+    data = path.read_bytes()
+    magic, version, length = struct.unpack('<4sII', data[:12])
+    assert (magic, version, length) == (b'glTF', 2, len(data))
+
+    size, = struct.unpack('<I', data[12:16])
+    document = json.loads(data[20:20 + size])
+    binary = data[20 + size + 8:]
+    assert len(binary) == document['buffers'][0]['byteLength']
+
+    def read(accessor, dtype, width):
+        view = document['bufferViews'][document['accessors'][accessor]['bufferView']]
+        chunk = binary[view['byteOffset']:view['byteOffset'] + view['byteLength']]
+        return np.frombuffer(chunk, dtype).reshape(-1, width)
+
+    lines, triangles = document['meshes'][0]['primitives']
+    assert np.allclose(read(lines['attributes']['_COORDINATES0'], '<f4', 4), p.vertices)
+    assert np.array_equal(read(lines['indices'], '<u4', 2), p.edges)
+    assert read(triangles['indices'], '<u4', 3).shape[0] == p.faces[1].shape[0] - 2 * p.face_count()
+
+
+def test_tiling_without_faces(tmp_path):
+    tiling = diagram.CoxeterDiagram([1, 0, 0], [4, 4]).tiling(depth=3)
+    for name in ('t.ply', 't.off', 't.gltf'):
+        export.export(str(tmp_path / name), tiling)
+    with open(tmp_path / 't.gltf') as f:
+        assert len(json.load(f)['meshes'][0]['primitives']) == 1
+    assert (tmp_path / 't.bin').stat().st_size > 0
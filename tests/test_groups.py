@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from polytope_visualizer.math import diagram
+from polytope_visualizer.math.groups import coxeter_matrix, classify, geometry, group_order, linear_matrix, \
+    parse_diagram
+
+
+@pytest.mark.parametrize("name, order", [
+    ('A4', 120),
+    ('B5', 3840),
+    ('D5', 1920),
+    ('E6', 51840),
+    ('E8', 696729600),
+    ('F4', 1152),
+    ('H4', 14400),
+    ('I2(7)', 14),
+])
+def test_classify(name, order):
+    matrix = coxeter_matrix(name)
+    assert classify(matrix) == [(name, list(range(len(matrix))))]
+    assert group_order(matrix) == order
+
+
+def test_reducible():
+    # A1 x A1 x B2, given as a linear diagram with gaps
+    matrix = linear_matrix([2, 2, 4])
+    assert [name for name, _ in classify(matrix)] == ['A1', 'A1', 'B2']
+    assert group_order(matrix) == 32
+
+
+@pytest.mark.parametrize("edges, kind", [
+    ([5, 3], 'spherical'),
+    ([3, 6], 'affine'),
+    ([4, 4], 'affine'),
+    ([3, 7], 'hyperbolic'),
+    ([5, 3, 3, 3], 'hyperbolic'),
+])
+def test_geometry(edges, kind):
+    assert geometry(linear_matrix(edges)) == kind
+
+
+def test_analyse():
+    analysis = diagram.CoxeterDiagram([1, 0, 0, 1], [5, 3, 3]).analyse()
+    assert analysis.finite
+    assert analysis.factors == ['H4']
+    assert analysis.order == 14400
+    assert analysis.vertex_count == 2400
+
+    infinite = diagram.CoxeterDiagram([1, 0, 0], [4, 4])
+    assert infinite.analyse().geometry == 'affine'
+    with pytest.raises(ValueError):
+        infinite.polytope()
+
+
+@pytest.mark.parametrize("text, edges, rings", [
+    ('{5,3,3}', [5, 3, 3], [1, 0, 0, 0]),
+    ('t0,3{4,3,3}', [4, 3, 3], [1, 0, 0, 1]),
+    ('x4o3x', [4, 3], [1, 0, 1]),
+])
+def test_parse_linear(text, edges, rings):
+    d = diagram.CoxeterDiagram.parse(text)
+    assert d == diagram.CoxeterDiagram(rings, edges)
+
+
+def test_parse_group():
+    matrix, nodes = parse_diagram('D4:xoox')
+    assert np.array_equal(matrix, coxeter_matrix('D4')) and nodes == [True, False, False, True]
+    assert parse_diagram('E6')[1] is None
+    with pytest.raises(ValueError):
+        diagram.CoxeterDiagram.parse('E6')
+    with pytest.raises(ValueError):
+        parse_diagram('D4:101')
@@ -0,0 +1,56 @@
+import logging
+import pytest
+
+from polytope_visualizer.math import diagram
+from polytope_visualizer.math.progress import Budget, BudgetExceeded, CancellationToken, GenerationCancelled
+
+
+@pytest.mark.parametrize("backend", ['todd_coxeter', 'frontier', 'bfs'])
+def test_progress_reports(backend):
+    reports = []
+    d = diagram.CoxeterDiagram([1, 0, 1, 1], [5, 3, 3])
+    d.polytope(backend=backend, progress=reports.append)
+    stages = {r.stage for r in reports}
+    assert 'edges' in stages
+    assert all(r.found >= 0 and r.frontier >= 0 for r in reports)
+
+
+def test_cancel():
+    token = CancellationToken()
+    token.cancel()
+    d = diagram.CoxeterDiagram([1, 1, 0, 0], [5, 3, 3])
+    with pytest.raises(GenerationCancelled):
+        d.polytope(token=token)
+    # A cancelled generation is not remembered
+    assert len(d.polytope().vertices) == 2400
+
+
+def test_budget():
+    d = diagram.CoxeterDiagram([0, 1, 0, 1], [5, 3, 3])
+    with pytest.raises(BudgetExceeded):
+        d.polytope(backend='frontier', budget=Budget(max_elements=1000))
+    with pytest.raises(BudgetExceeded):
+        d.polytope(backend='frontier', budget=Budget(max_bytes=10000))
+
+
+def test_stream_cancel():
+    token = CancellationToken()
+    chunks = diagram.CoxeterDiagram([1, 0, 0, 0], [5, 3, 3]).iter_polytope(token=token)
+    next(chunks)
+    token.cancel()
+    with pytest.raises(GenerationCancelled):
+        list(chunks)
+
+
+def test_profile(caplog):
+    d = diagram.CoxeterDiagram([1, 0, 0, 1], [4, 3, 3])
+    with caplog.at_level(logging.DEBUG, logger='polytope_visualizer'):
+        polytope, stats = d.profile(backend='orbit', trace_memory=True)
+    assert list(stats.stages) == ['analyse', 'normals', 'start_point', 'orbit', 'edges', 'faces']
+    orbit = stats.stages['orbit']
+    assert orbit.levels > 0 and sum(orbit.frontier_sizes) == len(polytope.vertices) - 1
+    # Every lookup either found a new vertex or a duplicate
+    assert orbit.counters['lookups'] - orbit.counters['duplicates'] == len(polytope.vertices) - 1
+    assert all(stage.peak_bytes is not None for stage in stats.stages.values())
+    assert stats.as_dict()['edges']['levels'] == stats.stages['edges'].levels
+    assert any('generated' in record.message for record in caplog.records)
@@ -0,0 +1,11 @@
+import numpy as np
+
+from polytope_visualizer.math.project_down import project, project_points
+
+
+def test_project_points():
+    points = np.random.default_rng(0).random((30, 5)) * 100
+    projected, heights = project_points(points, 300, 600)
+    for point, p, h in zip(points, projected, heights):
+        expected, height = project(point, 300, 600)
+        assert np.allclose(p, expected) and np.isclose(h, height)
@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+
+from polytope_visualizer.math.rotate import Rotor, RotorChain, rotate, rotate_points
+
+
+def test_rotor_matches_rotate():
+    points = np.random.default_rng(0).random((20, 4))
+    expected = np.array([rotate(p, 0.7, 1, 3) for p in points])
+    assert np.allclose(Rotor(1, 3, 0.7).rotate(points), expected)
+
+
+def test_chain():
+    points = np.random.default_rng(1).random((20, 4))
+    rotors = [Rotor(0, 1, 0.3), Rotor(2, 3, 1.1), Rotor(1, 3, -0.7)]
+    expected = points
+    for rotor in rotors:
+        expected = rotor.rotate(expected)
+
+    chain = RotorChain(rotors)
+    assert np.allclose(chain.rotate(points), expected)
+    # Rotors whose axes do not exist are skipped
+    chain.set_rotors(rotors + [Rotor(0, 4, 1.0)])
+    assert np.allclose(chain.rotate(points), expected)
+
+
+def test_chain_rebuilds_on_change():
+    rotor = Rotor(0, 1, 0.0)
+    chain = RotorChain([rotor])
+    matrix = chain.matrix(3)
+    assert chain.matrix(3) is matrix
+
+    rotor.angle = math.pi / 2
+    assert np.allclose(chain.rotate(np.array([[1.0, 0, 0]])), [[0, 1, 0]])
+    rotor.axes[1] = 2
+    assert np.allclose(chain.rotate(np.array([[1.0, 0, 0]])), [[0, 0, 1]])
+    assert chain.matrix(3, np.float32).dtype == np.float32
+
+
+def test_rotate_points():
+    points = np.random.default_rng(2).random((20, 5))
+    expected = np.array([rotate(p, 1.3, 0, 4) for p in points])
+    assert np.allclose(rotate_points(points, 1.3, 0, 4), expected)
+    assert rotate_points(points.astype(np.float32), 1.3, 0, 4).dtype == np.float32
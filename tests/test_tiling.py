@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from polytope_visualizer.math import diagram
+
+
+def _degrees(polytope):
+    return np.bincount(polytope.edges.ravel(), minlength=len(polytope.vertices))
+
+
+def test_square_tiling():
+    d = diagram.CoxeterDiagram([1, 0, 0], [4, 4])
+    tiling = d.tiling(radius=10)
+    assert tiling.vertices.shape[1] == 2
+    lengths = np.linalg.norm(tiling.vertices[tiling.edges[:, 0]] - tiling.vertices[tiling.edges[:, 1]], axis=1)
+    assert np.allclose(lengths, 1)
+    # Away from the boundary every vertex meets four squares
+    inner = np.linalg.norm(tiling.vertices, axis=1) < 9
+    assert np.all(_degrees(tiling)[inner] == 4)
+    assert len(set(map(tuple, np.sort(tiling.edges, axis=1).tolist()))) == len(tiling.edges)
+
+
+def test_hyperbolic_tiling():
+    # The order-7 triangular tiling in the Poincaré disk
+    d = diagram.CoxeterDiagram([1, 0, 0], [3, 7])
+    tiling = d.tiling(radius=4)
+    assert np.all(np.linalg.norm(tiling.vertices, axis=1) < 1)
+    assert np.allclose(tiling.vertices[0], 0)
+    assert _degrees(tiling).max() == 7
+
+
+def test_depth_bound():
+    d = diagram.CoxeterDiagram([1, 1, 1], [6, 3])
+    chunks = list(d.iter_tiling(depth=3))
+    assert len(chunks) == 4
+    with pytest.raises(ValueError):
+        next(d.iter_tiling())
@@ -0,0 +1,39 @@
+import numpy as np
+
+from polytope_visualizer.math import diagram
+from polytope_visualizer.math.vertex_index import VertexIndex
+
+
+def test_add_and_find():
+    index = VertexIndex(3)
+    assert index.add([0.1, 0.2, 0.3]) == (0, True)
+    assert index.add([0.4, 0.5, 0.6]) == (1, True)
+    assert index.add([0.1, 0.2, 0.3 + 1e-12]) == (0, False)
+    assert index.find([0.4, 0.5, 0.6]) == 1
+    assert index.find([0.7, 0.8, 0.9]) == -1
+    assert len(index) == 2
+
+
+def test_cell_boundary():
+    index = VertexIndex(2, resolution=1.0)
+    # Both points round to different cells but lie either side of the same wall
+    index.add([0.5 - 1e-9, 0.0])
+    assert index.find([0.5 + 1e-9, 0.0]) == 0
+    assert index.add([0.5 + 1e-9, 0.0]) == (0, False)
+
+
+def test_add_many():
+    index = VertexIndex(2)
+    index.add([1.0, 0.0])
+    points = np.array([[0.0, 1.0], [1.0, 0.0], [0.0, 1.0 + 1e-13], [-1.0, 0.0]])
+    indices, is_new = index.add_many(points)
+    assert list(indices) == [1, 0, 1, 2]
+    assert list(is_new) == [True, False, False, True]
+    assert np.allclose(index.points, [[1, 0], [0, 1], [-1, 0]])
+    assert list(index.find_many(points)) == [1, 0, 1, 2]
+
+
+def test_bfs_group_order():
+    d = diagram.CoxeterDiagram([1, 1, 1], [5, 3])
+    normals = d.mirror_normals()
+    assert len(d.find_reflection_sequences(normals)) == 120
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from polytope_visualizer.math import diagram
+from polytope_visualizer.math.wythoff import orbit_edges
+
+
+@pytest.mark.parametrize("nodes, edges, vertex_count, edge_count, face_count", [
+    ([1, 0, 0], [5, 3], 20, 30, 12),            # dodecahedron
+    ([0, 0, 1], [5, 3], 12, 30, 20),            # icosahedron
+    ([1, 1, 0], [4, 3], 24, 36, 14),            # truncated cube
+    ([1, 1, 1], [5, 3], 120, 180, 62),          # truncated icosidodecahedron
+    ([1, 0, 0, 0], [4, 3, 3], 16, 32, 24),      # tesseract
+    ([0, 0, 0, 1], [5, 3, 3], 120, 720, 1200),  # 600-cell
+    ([1, 0, 0, 1], [3, 3, 3], 20, 60, 70),      # runcinated 5-cell
+])
+def test_counts(nodes, edges, vertex_count, edge_count, face_count):
+    polytope = diagram.CoxeterDiagram(nodes, edges).polytope()
+    assert polytope.vertices.shape == (vertex_count, len(nodes))
+    assert polytope.edges.shape == (edge_count, 2)
+    assert polytope.face_count() == face_count
+
+
+def test_faces_are_edge_cycles():
+    polytope = diagram.CoxeterDiagram([1, 1, 0, 1], [4, 3, 3]).polytope()
+    edges = set(map(tuple, np.sort(polytope.edges, axis=1).tolist()))
+    for idx in range(polytope.face_count()):
+        face = polytope.face(idx)
+        assert len(set(face.tolist())) == len(face)
+        for a, b in zip(face, np.roll(face, -1)):
+            assert (min(a, b), max(a, b)) in edges
+
+
+def test_orbit_edges():
+    # A square's vertices permuted by two reflections
+    permutations = np.array([[1, 3], [0, 2], [3, 1], [2, 0]])
+    assert sorted(map(tuple, orbit_edges(permutations, [[0, 1]]).tolist())) == [(0, 1), (2, 3)]
+    edges = orbit_edges(permutations, [[0, 1], [0, 3]])
+    assert sorted(map(tuple, edges.tolist())) == [(0, 1), (0, 3), (1, 2), (2, 3)]
+
+
+def test_face_lattice():
+    polytope = diagram.CoxeterDiagram([1, 0, 0, 0], [4, 3, 3]).polytope()
+    lattice = polytope.lattice
+    # Cells are enumerated without the levels below them
+    assert lattice.count(3) == 8
+    assert set(lattice._faces) == {3}
+    assert [lattice.count(k) for k in range(5)] == [16, 32, 24, 8, 1]
+    # Each cube has six squares, and each square lies on two cubes
+    incidence = lattice.incidence(3)
+    assert np.all(incidence.sum(axis=0) == 6)
+    assert np.all(incidence.sum(axis=1) == 2)
+    assert np.all(lattice.incidence(1).sum(axis=0) == 2)
+
+
+def test_face_lattice_120_cell():
+    lattice = diagram.CoxeterDiagram([1, 0, 0, 0], [5, 3, 3]).polytope().lattice
+    assert lattice.count(3) == 120
+    assert np.all(np.diff(lattice.faces(3).indptr) == 20)